@@ -8,16 +8,24 @@ import random
 from typing import Optional
 from character import Character
 from weapon import Weapon
+from boss_behaviours import CompiledBossBehaviour, compile_behaviour
 
 class Boss(Character):
     """
     Special type of character that inherits from Character.
     
     This class demonstrates inheritance and method overriding.
-    Bosses have special attacks and unique mechanics.
+    Bosses have special attacks and unique mechanics, defined by a
+    compiled behaviour from boss_behaviours.py.
     """
     
-    def __init__(self, name: str, max_health: int, weapon: Weapon, special_attack: str):
+    is_boss = True
+    
+    # Shared module-level generator unless a dedicated one is injected
+    rng = random
+    
+    def __init__(self, name: str, max_health: int, weapon: Weapon, special_attack: str,
+                 rng: Optional[random.Random] = None, behaviour=None):
         """
         Initialize a new boss character.
         
@@ -26,16 +34,35 @@ class Boss(Character):
             max_health (int): Maximum health points
             weapon (Weapon): The boss's weapon
             special_attack (str): Name of the boss's special attack
+            rng (random.Random, optional): Dedicated generator for special attack rolls
+            behaviour (str, dict or CompiledBossBehaviour, optional): Boss
+                behaviour; chosen from the special attack name if not given
         """
         super().__init__(name, max_health, weapon)
+        self.behaviour: CompiledBossBehaviour = compile_behaviour(behaviour, special_attack)
         self.special_attack_name = special_attack
         self.special_attack_cooldown = 0
         self.turn_count = 0
         self.enraged = False
+        if rng is not None:
+            self.rng = rng
         
         # Boss stats are generally better than regular characters
-        self.defense += 3
-        self.weapon.base_damage = int(self.weapon.base_damage * 1.5)
+        self.defense += self.behaviour.defense_bonus
+        self.weapon.base_damage = int(self.weapon.base_damage * self.behaviour.damage_multiplier)
+        self.weapon.clear_damage_rows()
+        self.enrage_health = int(max_health * self.behaviour.enrage_threshold)
+    
+    def reset(self, name: str, max_health: int, weapon: Weapon, special_attack: str,
+              rng: Optional[random.Random] = None, behaviour=None):
+        """
+        Re-initialise this boss in place, as if it had just been constructed.
+        
+        The weapon should already be reset to its base stats, because the boss
+        bonuses are applied to it again.
+        """
+        self.__dict__.pop("rng", None)  # Fall back to the shared generator
+        self.__init__(name, max_health, weapon, special_attack, rng, behaviour)
     
     def __str__(self) -> str:
         """Return a string representation of the boss."""
@@ -50,8 +77,8 @@ class Boss(Character):
         if self.special_attack_cooldown > 0:
             self.special_attack_cooldown -= 1
         
-        # Check for enrage at 50% health
-        if not self.enraged and self.health <= self.max_health // 2:
+        # Check for enrage (at 50% health by default)
+        if not self.enraged and self.health <= self.enrage_health:
             self.enrage()
     
     def enrage(self):
@@ -60,11 +87,12 @@ class Boss(Character):
             return
             
         self.enraged = True
-        self.weapon.base_damage = int(self.weapon.base_damage * 1.5)
-        self.defense += 2
+        self.weapon.base_damage = int(self.weapon.base_damage * self.behaviour.enrage_damage_multiplier)
+        self.weapon.clear_damage_rows()
+        self.defense += self.behaviour.enrage_defense_bonus
         
         # Heal slightly when enraging
-        self.heal(self.max_health // 4)
+        self.heal(int(self.max_health * self.behaviour.enrage_heal_fraction))
     
     def attack(self, target) -> int:
         """
@@ -81,14 +109,14 @@ class Boss(Character):
         
         # Use special attack if available
         if (self.special_attack_cooldown == 0 and 
-            (self.enraged or random.random() < 0.3)):  # 30% chance to use special when not enraged
+            (self.enraged or self.rng.random() < self.behaviour.special_chance)):
             return self.special_attack(target)
             
         # Normal attack
         damage = super().attack(target)
         
         # Enraged bosses attack twice
-        if self.enraged and random.random() < 0.5:  # 50% chance for double attack
+        if self.enraged and self.rng.random() < self.behaviour.double_attack_chance:
             damage += super().attack(target)
             
         return damage
@@ -106,16 +134,18 @@ class Boss(Character):
         if not self.is_alive():
             return 0
             
-        # Set cooldown for special attack (2-4 turns)
-        self.special_attack_cooldown = random.randint(2, 4)
+        behaviour = self.behaviour
+        
+        # Set cooldown for special attack (2-4 turns by default)
+        self.special_attack_cooldown = self.rng.randint(behaviour.cooldown_min, behaviour.cooldown_max)
         
-        # Special attack deals 1.5x to 2.5x normal damage
+        # Special attack deals 1.5x to 2.5x normal damage by default
         base_damage = self.weapon.base_damage
-        special_multiplier = 1.5 + random.random()  # 1.5 to 2.5x
+        special_multiplier = behaviour.multiplier_low + self.rng.random() * behaviour.multiplier_span
         damage = int(base_damage * special_multiplier)
         
-        # Critical hit chance is doubled for special attacks
-        if random.random() < self.weapon.critical_chance * 2:
+        # Critical hit chance is doubled for special attacks by default
+        if self.rng.random() < self.weapon.critical_chance * behaviour.special_crit_factor:
             damage = int(damage * self.weapon.critical_multiplier)
             self.weapon.critical_hit = True
         else:
@@ -124,11 +154,9 @@ class Boss(Character):
         # Apply damage to target
         actual_damage = target.take_damage(damage, self)
         
-        # Additional effects based on special attack type
-        if "fire" in self.special_attack_name.lower() and hasattr(target, 'apply_burn'):
-            target.apply_burn(damage // 4, 3)  # Burn for 25% of damage over 3 turns
-        elif "freeze" in self.special_attack_name.lower() and hasattr(target, 'apply_stun'):
-            target.apply_stun(1)  # Stun for 1 turn
+        # Additional effects from the boss behaviour, e.g. burn or stun
+        for effect in behaviour.on_hit:
+            effect(target, damage)
             
         return actual_damage
     
@@ -0,0 +1,206 @@
+"""
+Data-driven boss behaviours for the RPG game.
+
+A boss behaviour is a plain dictionary of numbers and effect names, like the
+encounter dictionaries in encounters.py. Any keys left out fall back to
+DEFAULT_BEHAVIOUR. Behaviours are compiled once into a CompiledBossBehaviour
+whose attributes and on-hit effect functions Boss uses directly, so a boss's
+turn involves no string matching.
+
+New boss types can be added without touching boss.py:
+
+    register_boss_behaviour("poison", {
+        "special_multiplier": (1.2, 1.8),
+        "on_hit": [{"effect": "burn", "fraction": 0.5, "turns": 4}],
+    })
+
+and then referenced from an encounter with "behaviour": "poison".
+"""
+from functools import partial
+from typing import Any, Callable, Dict, Union
+
+DEFAULT_BEHAVIOUR: Dict[str, Any] = {
+    "damage_multiplier": 1.5,          # Applied to the weapon when the boss is created
+    "defense_bonus": 3,                # Added to the base defence when the boss is created
+    "special_chance": 0.3,             # Chance to use the special attack when not enraged
+    "special_multiplier": (1.5, 2.5),  # Range of the special attack damage multiplier
+    "special_crit_factor": 2.0,        # Critical chance multiplier for special attacks
+    "cooldown": (2, 4),                # Turns before the special attack can be used again
+    "double_attack_chance": 0.5,       # Chance of a second normal attack when enraged
+    "enrage_threshold": 0.5,           # Enrage at or below this fraction of max health
+    "enrage_damage_multiplier": 1.5,
+    "enrage_defense_bonus": 2,
+    "enrage_heal_fraction": 0.25,      # Fraction of max health healed on enraging
+    "on_hit": [],                      # Effects applied after a special attack lands
+}
+
+
+def burn(target, damage: int, fraction: float = 0.25, turns: int = 3):
+    """
+    Set the target on fire, if it can burn.
+
+    Args:
+        target (Character): The character hit by the special attack
+        damage (int): Special attack damage before defences
+        fraction (float, optional): Share of the damage dealt as burn
+        turns (int, optional): How long the burn lasts
+    """
+    apply_burn = getattr(target, "apply_burn", None)
+    if apply_burn is not None:
+        apply_burn(int(damage * fraction), turns)
+
+
+def stun(target, damage: int, turns: int = 1):
+    """
+    Stun the target, if it can be stunned.
+
+    Args:
+        target (Character): The character hit by the special attack
+        damage (int): Special attack damage before defences (unused)
+        turns (int, optional): How long the stun lasts
+    """
+    apply_stun = getattr(target, "apply_stun", None)
+    if apply_stun is not None:
+        apply_stun(turns)
+
+
+ON_HIT_EFFECTS: Dict[str, Callable] = {
+    "burn": burn,
+    "stun": stun,
+}
+
+BOSS_BEHAVIOURS: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "fire": {"on_hit": [{"effect": "burn", "fraction": 0.25, "turns": 3}]},
+    "freeze": {"on_hit": [{"effect": "stun", "turns": 1}]},
+}
+
+_compiled: Dict[str, "CompiledBossBehaviour"] = {}
+
+
+class CompiledBossBehaviour:
+    """
+    A boss behaviour turned into ready-to-use numbers and functions.
+
+    Compiled behaviours never change, so bosses of the same type share one.
+    The full specification, defaults included, is kept in spec so tools can
+    tell whether two behaviours play the same.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        """
+        Compile a behaviour specification.
+
+        Args:
+            spec (dict): Behaviour keys overriding DEFAULT_BEHAVIOUR
+
+        Raises:
+            ValueError: If the spec has unknown keys or effects
+        """
+        unknown = set(spec) - set(DEFAULT_BEHAVIOUR)
+        if unknown:
+            raise ValueError(f"Unknown boss behaviour keys: {sorted(unknown)}")
+        merged = dict(DEFAULT_BEHAVIOUR)
+        merged.update(spec)
+        self.spec = merged
+
+        self.damage_multiplier = merged["damage_multiplier"]
+        self.defense_bonus = merged["defense_bonus"]
+        self.special_chance = merged["special_chance"]
+        self.multiplier_low, multiplier_high = merged["special_multiplier"]
+        self.multiplier_span = multiplier_high - self.multiplier_low
+        self.special_crit_factor = merged["special_crit_factor"]
+        self.cooldown_min, self.cooldown_max = merged["cooldown"]
+        self.double_attack_chance = merged["double_attack_chance"]
+        self.enrage_threshold = merged["enrage_threshold"]
+        self.enrage_damage_multiplier = merged["enrage_damage_multiplier"]
+        self.enrage_defense_bonus = merged["enrage_defense_bonus"]
+        self.enrage_heal_fraction = merged["enrage_heal_fraction"]
+        self.on_hit = tuple(self._compile_effect(effect) for effect in merged["on_hit"])
+
+    @staticmethod
+    def _compile_effect(effect: Dict[str, Any]) -> Callable:
+        """Bind an on-hit effect's parameters to its function."""
+        params = dict(effect)
+        name = params.pop("effect")
+        if name not in ON_HIT_EFFECTS:
+            raise ValueError(f"Unknown on-hit effect: {name}")
+        return partial(ON_HIT_EFFECTS[name], **params)
+
+
+def register_boss_behaviour(name: str, spec: Dict[str, Any]):
+    """
+    Add (or replace) a named boss behaviour.
+
+    Args:
+        name (str): Name used in encounter data
+        spec (dict): Behaviour keys overriding DEFAULT_BEHAVIOUR
+    """
+    CompiledBossBehaviour(spec)  # Fail early on a bad spec
+    BOSS_BEHAVIOURS[name] = spec
+    _compiled.pop(name, None)
+
+
+def register_on_hit_effect(name: str, effect: Callable):
+    """
+    Add (or replace) an on-hit effect that behaviours can refer to.
+
+    Args:
+        name (str): Name used in "on_hit" entries
+        effect (callable): Called as effect(target, damage, **params)
+    """
+    ON_HIT_EFFECTS[name] = effect
+    _compiled.clear()  # Compiled behaviours may hold the old function
+
+
+def behaviour_for_attack_name(special_attack: str) -> str:
+    """
+    Pick a built-in behaviour from a special attack's name.
+
+    Keeps older encounter data working: names mentioning fire burn and
+    names mentioning freeze stun.
+
+    Args:
+        special_attack (str): Name of the boss's special attack
+
+    Returns:
+        str: Name of a behaviour in BOSS_BEHAVIOURS
+    """
+    lowered = special_attack.lower()
+    if "fire" in lowered:
+        return "fire"
+    if "freeze" in lowered:
+        return "freeze"
+    return "default"
+
+
+def compile_behaviour(behaviour: Union[None, str, Dict[str, Any], CompiledBossBehaviour],
+                      special_attack: str = "") -> CompiledBossBehaviour:
+    """
+    Get the compiled form of a behaviour.
+
+    Args:
+        behaviour: A registered name, a spec dictionary, an already compiled
+            behaviour, or None to choose one from the special attack name
+        special_attack (str, optional): Used when behaviour is None
+
+    Returns:
+        CompiledBossBehaviour: The compiled behaviour
+
+    Raises:
+        ValueError: If a named behaviour is not registered
+    """
+    if isinstance(behaviour, CompiledBossBehaviour):
+        return behaviour
+    if isinstance(behaviour, dict):
+        return CompiledBossBehaviour(behaviour)
+    if behaviour is None:
+        behaviour = behaviour_for_attack_name(special_attack)
+
+    compiled = _compiled.get(behaviour)
+    if compiled is None:
+        if behaviour not in BOSS_BEHAVIOURS:
+            raise ValueError(f"Unknown boss behaviour: {behaviour}")
+        compiled = CompiledBossBehaviour(BOSS_BEHAVIOURS[behaviour])
+        _compiled[behaviour] = compiled
+    return compiled
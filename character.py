@@ -17,6 +17,8 @@ class Character:
     - Polymorphism (through overridden methods)
     """
     
+    is_boss = False
+    
     def __init__(self, name: str, max_health: int, weapon: Weapon):
         """
         Initialize a new character.
@@ -40,6 +42,15 @@ class Character:
         self.health_bonus_used = False
         self.attack_bonus_used = False
     
+    def reset(self, name: str, max_health: int, weapon: Weapon):
+        """
+        Re-initialise this character in place, as if it had just been constructed.
+        
+        Used by object pools to recycle characters instead of allocating new ones.
+        Takes the same arguments as the constructor.
+        """
+        self.__init__(name, max_health, weapon)
+    
     def __str__(self) -> str:
         """Return a string representation of the character."""
         return (f"{self.name} (Lvl {self.level}) - "
@@ -76,6 +87,9 @@ class Character:
         """
         return self._max_health
     
+    def start_turn(self):
+        """Called at the start of the character's turn. Bosses override this."""
+    
     def is_alive(self) -> bool:
         """
         Check if the character is still alive.
@@ -214,18 +228,27 @@ class Character:
         if hasattr(self, 'weapon') and self.weapon:
             self.weapon.upgrade()
     
-    def gain_experience(self, amount: int):
+    def gain_experience(self, amount: int, announce: bool = True) -> int:
         """
         Gain experience points and level up if enough XP is accumulated.
         
         Args:
             amount (int): Amount of experience to gain
+            announce (bool, optional): Whether to print a message per level up
+            
+        Returns:
+            int: Number of levels gained
         """
         self.experience += amount
         xp_for_next_level = self.level * 100
+        levels_gained = 0
         
         while self.experience >= xp_for_next_level:
             self.experience -= xp_for_next_level
             self.level_up()
             xp_for_next_level = self.level * 100
-            print(f"{self.name} leveled up to level {self.level}!")
+            levels_gained += 1
+            if announce:
+                print(f"{self.name} leveled up to level {self.level}!")
+        
+        return levels_gained
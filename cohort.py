@@ -0,0 +1,223 @@
+"""
+Cohort progression simulator for XP and level curves.
+
+Instead of calling Character.gain_experience on one object at a time, a
+Cohort counts how many characters share each progression state
+
+    (level, experience, max_health, defense, weapon_damage) -> count
+
+and applies an XP reward once per state and reward. A cohort of a million
+characters usually holds only a few dozen distinct states, so a step costs
+the same whatever the cohort size. The rules are the same as
+Character.gain_experience and Character.level_up:
+
+- the XP needed for the next level is level * 100
+- each level up adds 10 max health (and fully heals), 1 defence and 1 weapon
+  damage (through Weapon.upgrade)
+
+When rewards vary, every state's count is shared between the rewards in
+proportion to their shares, so counts become expected numbers of characters
+(floats). The result is the exact expectation of giving each character a
+random reward, whatever the cohort size or the order of the rewards.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Tuple, Union
+
+# (level, experience, max_health, defense, weapon_damage)
+CohortState = Tuple[int, int, int, int, int]
+_STAT_NAMES = ("level", "experience", "max_health", "defense", "weapon_damage")
+
+
+def levels_gained(level: int, experience: int, amount: int) -> Tuple[int, int]:
+    """
+    Apply an XP reward the way Character.gain_experience does.
+
+    Args:
+        level (int): Current level
+        experience (int): Current experience towards the next level
+        amount (int): Experience gained
+
+    Returns:
+        tuple: (levels gained, experience left over)
+    """
+    experience += amount
+    xp_for_next_level = level * 100
+    gained = 0
+    while experience >= xp_for_next_level:
+        experience -= xp_for_next_level
+        gained += 1
+        xp_for_next_level = (level + gained) * 100
+    return gained, experience
+
+
+def victory_rewards(turn_shares: Mapping[int, float]) -> Dict[int, float]:
+    """
+    Convert a fight-length distribution into XP rewards, as Game.check_victory does.
+
+    Args:
+        turn_shares (mapping): Number of turns a fight took to the share (or
+            count) of characters whose fight took that long
+
+    Returns:
+        dict: XP reward to share of characters
+    """
+    rewards: Dict[int, float] = {}
+    for turns, share in turn_shares.items():
+        rewards[50 * turns] = rewards.get(50 * turns, 0) + share
+    return rewards
+
+
+class Cohort:
+    """
+    A population of characters stored as (expected) counts per progression state.
+    """
+
+    def __init__(self, size: int, level: int = 1, experience: int = 0, max_health: int = 50,
+                 defense: int = 5, weapon_damage: int = 6):
+        """
+        Initialise a cohort of identical characters.
+
+        The defaults match the player created by Game.create_player.
+
+        Args:
+            size (int): Number of characters
+            level (int, optional): Starting level
+            experience (int, optional): Starting experience
+            max_health (int, optional): Starting maximum health
+            defense (int, optional): Starting defence
+            weapon_damage (int, optional): Starting weapon base damage
+        """
+        self.states: Counter = Counter()
+        if size:
+            self.states[(level, experience, max_health, defense, weapon_damage)] = size
+        self.history: List[Dict[int, float]] = []
+
+    @classmethod
+    def from_characters(cls, characters: Iterable) -> "Cohort":
+        """
+        Build a cohort from existing Character objects.
+
+        Args:
+            characters (iterable): Characters to copy the stats of
+
+        Returns:
+            Cohort: A cohort holding the same progression stats
+        """
+        cohort = cls(0)
+        cohort.states.update((character.level, character.experience, character.max_health,
+                              character.defense, character.weapon.base_damage)
+                             for character in characters)
+        return cohort
+
+    def __len__(self) -> int:
+        """Return the number of characters in the cohort."""
+        return round(sum(self.states.values()))
+
+    def apply_rewards(self, rewards: Union[int, Mapping[int, float]]) -> Dict[int, float]:
+        """
+        Give every character an XP reward and level them up as needed.
+
+        Args:
+            rewards (int or mapping): One reward for everyone, or XP reward to
+                the share (or count) of characters receiving it. Each state's
+                count is divided between the rewards in proportion to the
+                shares, giving expected (fractional) counts.
+
+        Returns:
+            dict: Level histogram after the step, also added to history
+        """
+        if isinstance(rewards, int):
+            rewards = {rewards: 1}
+        total = sum(rewards.values())
+        if not rewards or min(rewards.values()) < 0 or total <= 0:
+            raise ValueError("Reward shares must be non-negative and not all zero")
+        fractions = [(amount, share / total) for amount, share in rewards.items() if share]
+
+        new_states: Counter = Counter()
+        for state, count in self.states.items():
+            level, experience, max_health, defense, weapon_damage = state
+            for amount, fraction in fractions:
+                gained, left_over = levels_gained(level, experience, amount)
+                # Keep whole counts whole when everyone gets the same reward
+                new_states[(level + gained, left_over, max_health + 10 * gained,
+                            defense + gained, weapon_damage + gained)] += (
+                    count if fraction == 1 else count * fraction)
+        self.states = new_states
+
+        histogram = self.level_histogram()
+        self.history.append(histogram)
+        return histogram
+
+    def apply_victories(self, turn_shares: Mapping[int, float]) -> Dict[int, float]:
+        """
+        Reward every character for a won fight, given how long fights took.
+
+        Args:
+            turn_shares (mapping): Number of turns to the share (or count) of
+                characters whose fight took that long
+
+        Returns:
+            dict: Level histogram after the step
+        """
+        return self.apply_rewards(victory_rewards(turn_shares))
+
+    def level_histogram(self) -> Dict[int, float]:
+        """
+        Count how many characters are at each level.
+
+        Returns:
+            dict: Level to (expected) number of characters, in level order
+        """
+        histogram: Counter = Counter()
+        for state, count in self.states.items():
+            histogram[state[0]] += count
+        return dict(sorted(histogram.items()))
+
+    def mean(self, stat: str) -> float:
+        """
+        Average one progression stat over the cohort.
+
+        Args:
+            stat (str): level, experience, max_health, defense or weapon_damage
+
+        Returns:
+            float: Mean value of the stat
+        """
+        index = _STAT_NAMES.index(stat)
+        total = sum(self.states.values())
+        return sum(state[index] * count for state, count in self.states.items()) / total
+
+    def stats(self) -> List[Tuple[Dict[str, int], float]]:
+        """
+        List the distinct progression states and how many characters share each.
+
+        Returns:
+            list: (stats, count) pairs, where stats holds level, experience,
+                max_health, defense and weapon_damage; most common first
+        """
+        return [(dict(zip(_STAT_NAMES, state)), count) for state, count in self.states.most_common()]
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    from character import Character
+    from weapon import Weapon
+
+    fight_lengths = {turns: 1 for turns in range(3, 13)}  # 3 to 12 turns, equally likely
+    cohort = Cohort(1_000_000)
+    started = time.perf_counter()
+    for step in range(8):
+        cohort.apply_victories(fight_lengths)
+    print(f"{time.perf_counter() - started:.4f}s for 8 steps of {len(cohort)} characters "
+          f"in {len(cohort.states)} distinct states")
+
+    # Check against the per-object rules with random fight lengths
+    rng = random.Random(0)
+    characters = [Character("Hero", 50, Weapon("Iron Sword", 6)) for _ in range(20_000)]
+    for step in range(8):
+        for character in characters:
+            character.gain_experience(50 * rng.randint(3, 12), announce=False)
+    sampled = sum(character.level for character in characters) / len(characters)
+    print(f"Mean level after 8 steps: cohort {cohort.mean('level'):.3f}, "
+          f"per-object sample of {len(characters)} {sampled:.3f}")
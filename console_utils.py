@@ -18,6 +18,19 @@ def print_border():
     """Print a border for visual separation."""
     print("-" * 80)
 
+def format_header(title: str) -> str:
+    """
+    Format a header as text, with a border above and below the title.
+    
+    Args:
+        title (str): The title to display in the header
+        
+    Returns:
+        str: The header, ending with a blank line
+    """
+    border = "-" * 80
+    return f"{border}\n{title:^80}\n{border}\n"
+
 def print_header(title: str):
     """
     Print a formatted header.
@@ -26,7 +39,4 @@ def print_header(title: str):
         title (str): The title to display in the header
     """
     clear_screen()
-    print_border()
-    print(f"{title:^80}")
-    print_border()
-    print()
+    print(format_header(title))
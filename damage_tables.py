@@ -0,0 +1,258 @@
+"""
+Precomputed damage distribution tables for the RPG game.
+
+A normal hit has only two possible outcomes, a regular hit or a critical
+hit, and which damage each one does depends on a handful of discrete stats.
+This module works those outcomes out once per attacker and defender state,
+exactly as Character.take_damage and Boss.take_damage would, so a hit can be
+resolved with one table lookup and one random draw.
+
+Each weapon points at the rows for its current stats (Weapon.damage_rows)
+and drops them whenever its stats change, so the hot path needs no cache
+lookup of its own. Weapons with the same stats share one set of rows.
+HeadlessGame(damage_tables=DamageTableCache()) uses the tables for every
+normal hit. Boss attacks use a continuous special attack multiplier and
+extra rolls, so they still go through Boss.attack.
+
+Run this module directly to benchmark hits and whole campaigns with and
+without the tables.
+"""
+from typing import Dict, List, Tuple
+
+from character import Character
+from weapon import Weapon
+
+# (critical chance, damage taken on a normal hit, damage taken on a critical hit)
+DamageRow = Tuple[float, int, int]
+
+
+def defender_state(defender: Character) -> Tuple[int, bool]:
+    """
+    Reduce a defender to the stats that decide how much damage it takes.
+
+    Args:
+        defender (Character): The character being hit
+
+    Returns:
+        tuple: (defence value applied to the hit, whether boss halving applies)
+    """
+    total_defense = defender.defense + defender.defense_bonus
+    defense_value = total_defense * 2 if defender.is_defending else total_defense
+    halved = defender.is_boss and not defender.enraged
+    return defense_value, halved
+
+
+def damage_taken(raw_damage: int, defense_value: int, halved: bool) -> int:
+    """
+    Work out the damage a living defender takes from a hit.
+
+    Mirrors Boss.take_damage followed by Character.take_damage.
+
+    Args:
+        raw_damage (int): Damage of the hit before defences
+        defense_value (int): Defence applied to the hit
+        halved (bool): Whether the defender is a boss that is not enraged
+
+    Returns:
+        int: Damage taken
+    """
+    if halved:
+        raw_damage = max(1, raw_damage // 2)
+    return max(1, raw_damage - defense_value)
+
+
+class DamageTableCache:
+    """
+    Resolves normal hits from precomputed outcome rows.
+
+    Rows are grouped by weapon stats and keyed by the attacker's attack bonus
+    and the defender state. A Weapon.upgrade (including the one in level_up)
+    or a Boss.enrage makes that weapon pick up the rows for its new stats on
+    its next hit. Defender changes such as extra defence from a level up or
+    losing boss halving on enrage simply lead to a different row.
+    """
+
+    def __init__(self):
+        """Initialise an empty cache."""
+        self._rows_by_stats: Dict[Tuple[int, float, float], Dict[Tuple[int, int, bool], DamageRow]] = {}
+        self.rows_built = 0
+
+    def row(self, attacker: Character, defender: Character) -> DamageRow:
+        """
+        Look up (or build) the outcome row for a hit.
+
+        Args:
+            attacker (Character): The attacking character
+            defender (Character): The character being hit
+
+        Returns:
+            tuple: (critical chance, normal damage taken, critical damage taken)
+        """
+        weapon = attacker.weapon
+        rows = weapon.damage_rows
+        if rows is None:
+            rows = self._rows_for(weapon)
+        key = (attacker.attack_bonus,) + defender_state(defender)
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = self._build_row(weapon, *key)
+        return row
+
+    def _rows_for(self, weapon: Weapon) -> Dict[Tuple[int, int, bool], DamageRow]:
+        """Attach the rows for a weapon's current stats to the weapon."""
+        stats = (weapon.base_damage, weapon.critical_chance, weapon.critical_multiplier)
+        rows = self._rows_by_stats.get(stats)
+        if rows is None:
+            rows = self._rows_by_stats[stats] = {}
+        weapon.damage_rows = rows
+        return rows
+
+    def _build_row(self, weapon: Weapon, attack_bonus: int, defense_value: int,
+                   halved: bool) -> DamageRow:
+        """Compute one row, mirroring Weapon.calculate_damage and Character.attack."""
+        self.rows_built += 1
+        normal = damage_taken(weapon.base_damage + attack_bonus, defense_value, halved)
+        critical = damage_taken(int(weapon.base_damage * weapon.critical_multiplier) + attack_bonus,
+                                defense_value, halved)
+        return weapon.critical_chance, normal, critical
+
+    def invalidate(self, attacker: Character):
+        """
+        Detach an attacker's weapon from its rows.
+
+        Not needed after level_up, enrage or the Weapon setters (those do it
+        themselves), but needed after changing weapon stats by hand.
+
+        Args:
+            attacker (Character): The attacker whose rows should be dropped
+        """
+        attacker.weapon.clear_damage_rows()
+
+    def distribution(self, attacker: Character, defender: Character) -> List[Tuple[int, float]]:
+        """
+        Give the damage distribution of the attacker's next normal hit.
+
+        Args:
+            attacker (Character): The attacking character
+            defender (Character): The character being hit
+
+        Returns:
+            list: (damage taken, probability) pairs
+        """
+        critical_chance, normal, critical = self.row(attacker, defender)
+        if normal == critical:
+            return [(normal, 1.0)]
+        return [(normal, 1.0 - critical_chance), (critical, critical_chance)]
+
+    def expected_damage(self, attacker: Character, defender: Character) -> float:
+        """
+        Give the average damage of the attacker's next normal hit.
+
+        Args:
+            attacker (Character): The attacking character
+            defender (Character): The character being hit
+
+        Returns:
+            float: Expected damage taken
+        """
+        return sum(damage * chance for damage, chance in self.distribution(attacker, defender))
+
+    def attack(self, attacker: Character, target: Character) -> int:
+        """
+        Resolve a normal attack using the table.
+
+        Has the same effect as attacker's Character.attack(target), including
+        the random draw from the attacker's weapon generator, the critical hit
+        flag, using up the attack bonus and resetting the target's defence.
+        The row lookup is written out here because this is the hot path.
+
+        Args:
+            attacker (Character): The attacking character
+            target (Character): The character to attack
+
+        Returns:
+            int: Damage dealt to the target
+        """
+        if attacker._health <= 0:
+            return 0
+
+        weapon = attacker.weapon
+        rows = weapon.damage_rows
+        if rows is None:
+            rows = self._rows_for(weapon)
+        attack_bonus = attacker.attack_bonus
+        total_defense = target.defense + target.defense_bonus
+        key = (attack_bonus,
+               total_defense * 2 if target.is_defending else total_defense,
+               target.is_boss and not target.enraged)
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = self._build_row(weapon, *key)
+
+        critical_hit = weapon.critical_hit = weapon.rng.random() < row[0]
+
+        if attack_bonus > 0:
+            attacker.attack_bonus = 0
+            attacker.attack_bonus_used = True
+
+        health = target._health
+        if health <= 0:
+            return 0
+
+        damage = row[2] if critical_hit else row[1]
+        # Damage is always at least 1, so only the lower bound of the health setter applies
+        target._health = health - damage if health > damage else 0
+        if target.is_defending:
+            target.is_defending = False
+            target.defense_bonus = 0
+        return damage
+
+
+def _benchmark(hits: int = 300_000, campaigns: int = 3_000, repeats: int = 5):
+    """Compare Character.attack with the table path, per hit and per campaign."""
+    import time
+    from simulation import RollStreams, simulate_campaign
+
+    tables = DamageTableCache()
+
+    def plain_hits():
+        attacker = Character("Hero", 50, Weapon("Iron Sword", 6, 0.15, 2.0))
+        target = Character("Orc", 10 ** 9, Weapon("Battle Axe", 8))
+        for i in range(hits):
+            if i % 3 == 0:
+                target.defend()
+            attacker.attack(target)
+
+    def table_hits():
+        attacker = Character("Hero", 50, Weapon("Iron Sword", 6, 0.15, 2.0))
+        target = Character("Orc", 10 ** 9, Weapon("Battle Axe", 8))
+        for i in range(hits):
+            if i % 3 == 0:
+                target.defend()
+            tables.attack(attacker, target)
+
+    streams = RollStreams(0)
+
+    def plain_campaigns():
+        for seed in range(campaigns):
+            simulate_campaign(seed, streams=streams)
+
+    def table_campaigns():
+        for seed in range(campaigns):
+            simulate_campaign(seed, streams=streams, damage_tables=tables)
+
+    for label, count, plain, table in (("hits", hits, plain_hits, table_hits),
+                                       ("campaigns", campaigns, plain_campaigns, table_campaigns)):
+        # Interleave the runs and keep the best time to reduce noise
+        best = {"plain": float("inf"), "tables": float("inf")}
+        for _ in range(repeats):
+            for name, run in (("plain", plain), ("tables", table)):
+                start = time.perf_counter()
+                run()
+                best[name] = min(best[name], time.perf_counter() - start)
+        print(f"{count} {label}: Character.attack {best['plain']:.3f}s, "
+              f"tables {best['tables']:.3f}s ({best['plain'] / best['tables']:.2f}x)")
+
+
+if __name__ == "__main__":
+    _benchmark()
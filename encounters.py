@@ -0,0 +1,264 @@
+"""
+Encounter sources for the RPG game.
+
+This module defines where the Game gets its enemies from. An encounter is a
+plain dictionary in the same format that Game.create_enemy expects:
+
+    {"name": str, "health": int, "weapon": Weapon,
+     "special_attack": str (bosses only), "is_boss": bool}
+
+Sources hand out encounters one at a time, so a campaign can be a short
+fixed list or an endless procedurally generated dungeon.
+"""
+import random
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+from weapon import Weapon
+
+
+def default_campaign() -> List[Dict[str, Any]]:
+    """
+    Build the standard three-fight campaign.
+
+    A fresh list (with fresh Weapon objects) is returned on every call because
+    Boss mutates the weapon it is given.
+
+    Returns:
+        list: Encounter dictionaries for the Goblin, Orc and Dragon
+    """
+    return [
+        {
+            "name": "Goblin",
+            "health": 30,
+            "weapon": Weapon("Rusty Dagger", 5),
+            "is_boss": False
+        },
+        {
+            "name": "Orc",
+            "health": 50,
+            "weapon": Weapon("Battle Axe", 8),
+            "is_boss": False
+        },
+        {
+            "name": "Dragon",
+            "health": 100,
+            "weapon": Weapon("Fire Breath", 12, 0.2),
+            "special_attack": "Inferno Breath",
+            "is_boss": True
+        },
+    ]
+
+
+class EncounterSource(ABC):
+    """
+    Base class for anything that supplies encounters to the Game.
+
+    Subclasses must implement has_next() and next_encounter(). A source is truthy
+    while it still has encounters, so `if self.encounters:` keeps working.
+    """
+
+    @abstractmethod
+    def has_next(self) -> bool:
+        """
+        Check whether another encounter is available.
+
+        Returns:
+            bool: True if next_encounter() can be called
+        """
+
+    @abstractmethod
+    def next_encounter(self) -> Dict[str, Any]:
+        """
+        Advance to and return the next encounter.
+
+        Returns:
+            dict: The next encounter's data
+
+        Raises:
+            IndexError: If no encounters are left
+        """
+
+    def __bool__(self) -> bool:
+        """Return True while the source still has encounters."""
+        return self.has_next()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over (and consume) the remaining encounters."""
+        while self.has_next():
+            yield self.next_encounter()
+
+
+class ListEncounterSource(EncounterSource):
+    """
+    Supplies encounters from a finite, pre-built sequence.
+
+    The encounters are held in a deque so advancing is O(1), unlike
+    list.pop(0).
+    """
+
+    def __init__(self, encounters: Iterable[Dict[str, Any]]):
+        """
+        Initialise the source.
+
+        Args:
+            encounters (iterable): Encounter dictionaries in play order
+        """
+        self._queue: Deque[Dict[str, Any]] = deque(encounters)
+
+    def __len__(self) -> int:
+        """Return the number of encounters left."""
+        return len(self._queue)
+
+    def has_next(self) -> bool:
+        """Return True if any encounters are left."""
+        return bool(self._queue)
+
+    def next_encounter(self) -> Dict[str, Any]:
+        """
+        Remove and return the next encounter.
+
+        Raises:
+            IndexError: If no encounters are left
+        """
+        if not self._queue:
+            raise IndexError("No more encounters in this campaign")
+        return self._queue.popleft()
+
+
+class ProceduralEncounterSource(EncounterSource):
+    """
+    Generates an endless (or capped) dungeon lazily from a seed.
+
+    Each depth is generated from its own seeded generator, so encounter N is
+    the same no matter how far ahead the source has prefetched. Enemy health
+    and weapon damage grow with depth, and bosses appear more often the
+    deeper the player goes.
+    """
+
+    ENEMY_TYPES = [
+        ("Goblin", "Rusty Dagger"),
+        ("Skeleton", "Bone Club"),
+        ("Orc", "Battle Axe"),
+        ("Troll", "Stone Maul"),
+        ("Dark Knight", "Cursed Blade"),
+    ]
+    BOSS_TYPES = [
+        ("Dragon", "Fire Breath", "Inferno Breath"),
+        ("Frost Giant", "Glacier Hammer", "Freezing Slam"),
+        ("Lich", "Soul Staff", "Death Bolt"),
+    ]
+
+    def __init__(self, seed: int = 0, prefetch: int = 4,
+                 max_encounters: Optional[int] = None):
+        """
+        Initialise the generator.
+
+        Args:
+            seed (int, optional): Seed that fixes the whole dungeon layout
+            prefetch (int, optional): How many encounters to generate ahead
+            max_encounters (int, optional): Stop after this many encounters
+                (None means the dungeon never ends)
+        """
+        self.seed = seed
+        self.prefetch = max(1, prefetch)
+        self.max_encounters = max_encounters
+        self.depth = 0  # Number of encounters handed out so far
+        self._next_depth = 0  # Depth of the next encounter to generate
+        self._window: Deque[Dict[str, Any]] = deque()
+
+    def has_next(self) -> bool:
+        """Return True unless the dungeon has a cap and it was reached."""
+        return self.max_encounters is None or self.depth < self.max_encounters
+
+    def next_encounter(self) -> Dict[str, Any]:
+        """
+        Advance one level deeper and return that encounter.
+
+        Returns:
+            dict: The encounter at the current depth
+
+        Raises:
+            IndexError: If the dungeon's cap has been reached
+        """
+        if not self.has_next():
+            raise IndexError("No more encounters in this dungeon")
+        self._fill_window()
+        self.depth += 1
+        return self._window.popleft()
+
+    def peek(self) -> Dict[str, Any]:
+        """
+        Look at the next encounter without advancing.
+
+        Returns:
+            dict: The next encounter's data
+
+        Raises:
+            IndexError: If the dungeon's cap has been reached
+        """
+        if not self.has_next():
+            raise IndexError("No more encounters in this dungeon")
+        self._fill_window()
+        return self._window[0]
+
+    def _fill_window(self):
+        """Top the prefetch window back up to its configured size."""
+        while len(self._window) < self.prefetch:
+            if (self.max_encounters is not None
+                    and self._next_depth >= self.max_encounters):
+                break
+            self._window.append(self.generate(self._next_depth))
+            self._next_depth += 1
+
+    def is_boss_depth(self, depth: int, rng: random.Random) -> bool:
+        """
+        Decide whether the encounter at a depth is a boss.
+
+        Every fifth encounter is always a boss; in between, the chance of a
+        boss rises by 2% per depth up to a cap of 40%.
+
+        Args:
+            depth (int): Zero-based depth in the dungeon
+            rng (random.Random): Generator for this depth
+
+        Returns:
+            bool: True if the encounter should be a boss
+        """
+        if depth % 5 == 4:
+            return True
+        return rng.random() < min(0.4, 0.02 * depth)
+
+    def generate(self, depth: int) -> Dict[str, Any]:
+        """
+        Build the encounter at a given depth.
+
+        Args:
+            depth (int): Zero-based depth in the dungeon
+
+        Returns:
+            dict: Encounter data in the format Game.create_enemy expects
+        """
+        rng = random.Random(self.seed * 1_000_003 + depth)
+        health = 30 + 10 * depth + rng.randint(0, 10)
+        damage = 5 + depth // 2 + rng.randint(0, 2)
+        crit_chance = min(0.35, 0.1 + 0.01 * depth)
+
+        if self.is_boss_depth(depth, rng):
+            name, weapon_name, special = rng.choice(self.BOSS_TYPES)
+            return {
+                "name": name,
+                "health": health * 2,
+                "weapon": Weapon(weapon_name, damage, crit_chance),
+                "special_attack": special,
+                "is_boss": True
+            }
+
+        name, weapon_name = rng.choice(self.ENEMY_TYPES)
+        return {
+            "name": name,
+            "health": health,
+            "weapon": Weapon(weapon_name, damage, crit_chance),
+            "is_boss": False
+        }
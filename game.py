@@ -5,14 +5,15 @@ This module contains the main Game class that manages the game state and flow.
 It demonstrates the use of other classes and handles the game loop.
 """
 import random
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional
 
 # Import other game components
 from character import Character
 from boss import Boss
 from weapon import Weapon
 from game_logger import GameLogger
-from console_utils import clear_screen, print_header, press_enter, print_border
+from encounters import EncounterSource, ListEncounterSource, default_campaign
+from game_io import ConsoleIO
 
 class Game:
     """
@@ -25,41 +26,45 @@ class Game:
     - State management
     """
     
-    def __init__(self):
-        """Initialize the game with default settings."""
-        self.logger = GameLogger()
+    PLAYER_MAX_HEALTH = 50
+    STARTING_WEAPON = ("Iron Sword", 6, 0.15, 2.0)  # Name, damage, critical chance and multiplier
+    
+    def __init__(self, encounters=None, logger: Optional[GameLogger] = None,
+                 rng: Optional[random.Random] = None, io: Optional[ConsoleIO] = None):
+        """
+        Initialize the game with default settings.
+        
+        Args:
+            encounters (EncounterSource or list, optional): Where enemies come
+                from. Defaults to the standard Goblin, Orc and Dragon campaign.
+            logger (GameLogger, optional): Logger for game events
+            rng (random.Random, optional): Generator for enemy AI and escape
+                rolls. Defaults to the module-level generator.
+            io (ConsoleIO, optional): Where input comes from and output goes.
+                Defaults to the terminal.
+        """
+        self.io = io if io is not None else ConsoleIO()
+        self.logger = logger if logger is not None else GameLogger(output=self.io.write)
+        self.rng = rng if rng is not None else random
+        self.escape_rng = self.rng  # Run-away rolls; simulations give them their own stream
         self.player: Optional[Character] = None
         self.current_enemy: Optional[Character] = None
         self.game_active: bool = False
         self.turn_count: int = 0
         self.defending: bool = False
+        self.turn_listeners: List[Callable[["Game"], None]] = []  # Called after every turn
+        self.error: Optional[Exception] = None  # Set if run() stopped on an unexpected error
         
         # Game balance settings
-        self.encounters: List[Dict[str, Any]] = [
-            {
-                "name": "Goblin",
-                "health": 30,
-                "weapon": Weapon("Rusty Dagger", 5),
-                "is_boss": False
-            },
-            {
-                "name": "Orc",
-                "health": 50,
-                "weapon": Weapon("Battle Axe", 8),
-                "is_boss": False
-            },
-            {
-                "name": "Dragon",
-                "health": 100,
-                "weapon": Weapon("Fire Breath", 12, 0.2),
-                "special_attack": "Inferno Breath",
-                "is_boss": True
-            },
-        ]
+        if encounters is None:
+            encounters = default_campaign()
+        if not isinstance(encounters, EncounterSource):
+            encounters = ListEncounterSource(encounters)
+        self.encounters: EncounterSource = encounters
     
     def clear_screen(self):
         """Clear the console screen."""
-        clear_screen()
+        self.io.clear()
     
     def print_header(self, title: str):
         """
@@ -68,7 +73,7 @@ class Game:
         Args:
             title (str): The title to display in the header
         """
-        print_header(title)
+        self.io.print_header(title)
     
     def setup_game(self):
         """Initialize the game state and create the player character."""
@@ -76,17 +81,43 @@ class Game:
         self.print_header("RPG Game - Character Creation")
         
         # Get player name
-        player_name = input("Enter your character's name: ").strip() or "Hero"
+        player_name = self.io.read("Enter your character's name: ").strip() or "Hero"
+        
+        self.create_player(player_name)
+        
+        self.io.write(f"\nWelcome, {player_name}! Your adventure begins...")
+        self.io.pause()
+    
+    def create_player(self, player_name: str) -> Character:
+        """
+        Create the player character with the starting weapon.
         
-        # Create player with starting weapon
-        starting_weapon = Weapon("Iron Sword", 6, 0.15, 2.0)
-        self.player = Character(player_name, 50, starting_weapon)
+        Args:
+            player_name (str): Name of the player character
+            
+        Returns:
+            Character: The newly created player
+        """
+        self.player = self.build_player(player_name)
         
         self.game_active = True
         self.turn_count = 0
+        return self.player
+    
+    def build_player(self, player_name: str) -> Character:
+        """
+        Construct the player character and its starting weapon.
+        
+        Simulations override this to recycle pooled objects.
         
-        print(f"\nWelcome, {player_name}! Your adventure begins...")
-        press_enter()
+        Args:
+            player_name (str): Name of the player character
+            
+        Returns:
+            Character: A player at full health with the starting weapon
+        """
+        starting_weapon = Weapon(*self.STARTING_WEAPON)
+        return Character(player_name, self.PLAYER_MAX_HEALTH, starting_weapon)
     
     def create_enemy(self, enemy_data: Dict[str, Any]) -> Character:
         """
@@ -103,7 +134,8 @@ class Game:
                 name=enemy_data["name"],
                 max_health=enemy_data["health"],
                 weapon=enemy_data["weapon"],
-                special_attack=enemy_data.get("special_attack", "Special Attack")
+                special_attack=enemy_data.get("special_attack", "Special Attack"),
+                behaviour=enemy_data.get("behaviour")
             )
         else:
             return Character(
@@ -112,6 +144,18 @@ class Game:
                 weapon=enemy_data["weapon"]
             )
     
+    def spawn_next_enemy(self) -> Character:
+        """
+        Take the next encounter from the encounter source and make it current.
+        
+        Returns:
+            Character: The enemy that was created
+        """
+        enemy_data = self.encounters.next_encounter()
+        self.current_enemy = self.create_enemy(enemy_data)
+        self.logger.log_event(f"A wild {self.current_enemy.name} appears!")
+        return self.current_enemy
+    
     def player_turn(self):
         """Handle the player's turn in combat."""
         if not self.player or not self.current_enemy:
@@ -121,70 +165,78 @@ class Game:
         self.print_header(f"Combat - Turn {self.turn_count}")
         
         # Show combat status
-        print(f"\n{self.player}")
-        print(f"{self.current_enemy}\n")
+        self.io.write(f"\n{self.player}")
+        self.io.write(f"{self.current_enemy}\n")
         
         # Show item usage status
         health_item_status = "(Used)" if self.player.health_bonus_used else "(Available)"
         attack_item_status = "(Used)" if self.player.attack_bonus_used else "(Available)"
         
         # Player actions
-        print("1. Attack")
-        print("2. Defend")
-        print("3. Use Health Potion", health_item_status)
-        print("4. Use Strength Potion", attack_item_status)
-        print("5. Run Away")
+        self.io.write("1. Attack")
+        self.io.write("2. Defend")
+        self.io.write("3. Use Health Potion", health_item_status)
+        self.io.write("4. Use Strength Potion", attack_item_status)
+        self.io.write("5. Run Away")
         
         while True:
-            try:
-                choice = input("\nChoose an action (1-5): ")
-                if choice == "1":
-                    # Attack
-                    damage = self.player.attack(self.current_enemy)
-                    self.logger.log_combat(self.player, self.current_enemy, damage)
-                    if self.player.attack_bonus > 0:
-                        self.logger.log_event(f"{self.player.name}'s attack is empowered! (+{self.player.attack_bonus} damage)")
-                    break
-                elif choice == "2":
-                    # Defend
-                    self.player.defend()
-                    self.logger.log_event(f"{self.player.name} prepares to defend! (+{self.player.defense_bonus} defense)")
-                    break
-                elif choice == "3":
-                    # Use health potion
-                    heal_amount = self.player.use_health_item()
-                    if heal_amount > 0:
-                        self.logger.log_heal(self.player, heal_amount)
-                    else:
-                        self.logger.log_event("You've already used your health potion for this battle!")
-                    break
-                elif choice == "4":
-                    # Use strength potion
-                    bonus = self.player.use_attack_item()
-                    if bonus > 0:
-                        self.logger.log_event(f"{self.player.name} drinks a strength potion! Next attack will deal +{bonus} damage!")
-                    else:
-                        self.logger.log_event("You've already used your strength potion for this battle!")
-                    break
-                elif choice == "5":
-                    # Run away
-                    if isinstance(self.current_enemy, Boss):
-                        self.logger.log_event("You can't run from a boss battle!")
-                        break
-                        
-                    if random.random() < 0.5:  # 50% chance to escape
-                        self.logger.log_event("You successfully ran away!")
-                        self.game_active = False
-                        return
-                    else:
-                        self.logger.log_event("You failed to escape!")
-                        break
-                else:
-                    print("Invalid choice. Please enter a number between 1 and 5.")
-            except ValueError:
-                print("Please enter a valid number.")
+            choice = self.io.read("\nChoose an action (1-5): ")
+            if self.resolve_player_action(choice):
+                break
+            self.io.write("Invalid choice. Please enter a number between 1 and 5.")
+        
+        # No pause after a successful escape
+        if not self.game_active:
+            return
+        
+        self.io.pause()
+    
+    def resolve_player_action(self, choice: str) -> bool:
+        """
+        Carry out one of the player's menu choices.
         
-        press_enter()
+        Args:
+            choice (str): Menu choice from "1" to "5"
+            
+        Returns:
+            bool: True if the choice was valid and used up the turn
+        """
+        if choice == "1":
+            # Attack
+            damage = self.perform_attack(self.player, self.current_enemy)
+            self.logger.log_combat(self.player, self.current_enemy, damage)
+            if self.player.attack_bonus > 0:
+                self.logger.log_event(f"{self.player.name}'s attack is empowered! (+{self.player.attack_bonus} damage)")
+        elif choice == "2":
+            # Defend
+            self.player.defend()
+            self.logger.log_event(f"{self.player.name} prepares to defend! (+{self.player.defense_bonus} defense)")
+        elif choice == "3":
+            # Use health potion
+            heal_amount = self.player.use_health_item()
+            if heal_amount > 0:
+                self.logger.log_heal(self.player, heal_amount)
+            else:
+                self.logger.log_event("You've already used your health potion for this battle!")
+        elif choice == "4":
+            # Use strength potion
+            bonus = self.player.use_attack_item()
+            if bonus > 0:
+                self.logger.log_event(f"{self.player.name} drinks a strength potion! Next attack will deal +{bonus} damage!")
+            else:
+                self.logger.log_event("You've already used your strength potion for this battle!")
+        elif choice == "5":
+            # Run away
+            if self.current_enemy.is_boss:
+                self.logger.log_event("You can't run from a boss battle!")
+            elif self.escape_rng.random() < 0.5:  # 50% chance to escape
+                self.logger.log_event("You successfully ran away!")
+                self.game_active = False
+            else:
+                self.logger.log_event("You failed to escape!")
+        else:
+            return False
+        return True
     
     def enemy_turn(self):
         """Handle the enemy's turn in combat."""
@@ -194,26 +246,41 @@ class Game:
         # Skip turn if enemy is dead
         if not self.current_enemy.is_alive():
             return
-            
-        # Special handling for bosses
-        if isinstance(self.current_enemy, Boss):
-            self.current_enemy.start_turn()
+        
+        self.resolve_enemy_action()
+        self.io.pause()
+    
+    def resolve_enemy_action(self):
+        """Let the enemy AI pick and carry out its action for this turn."""
+        # Bosses update cooldowns and enrage here; ordinary enemies do nothing
+        self.current_enemy.start_turn()
         
         # Simple AI: 70% chance to attack, 30% chance to defend
-        action = random.choices(
+        action = self.rng.choices(
             ["attack", "defend"],
             weights=[0.7, 0.3],
             k=1
         )[0]
         
         if action == "attack":
-            damage = self.current_enemy.attack(self.player)
+            damage = self.perform_attack(self.current_enemy, self.player)
             self.logger.log_combat(self.current_enemy, self.player, damage)
         else:
             self.current_enemy.defend()
             self.logger.log_event(f"{self.current_enemy.name} prepares to defend!")
+    
+    def perform_attack(self, attacker: Character, target: Character) -> int:
+        """
+        Carry out an attack. Simulations override this to resolve hits faster.
         
-        press_enter()
+        Args:
+            attacker (Character): The attacking character
+            target (Character): The character being attacked
+            
+        Returns:
+            int: Damage dealt to the target
+        """
+        return attacker.attack(target)
     
     def check_victory(self):
         """Check if the player has defeated all enemies."""
@@ -223,17 +290,18 @@ class Game:
             
             # Grant experience
             xp_reward = 50 * self.turn_count  # More XP for longer fights
-            self.player.gain_experience(xp_reward)
+            old_level = self.player.level
+            self.player.gain_experience(xp_reward, announce=False)
+            if self.logger.log_to_console:
+                for level in range(old_level + 1, self.player.level + 1):
+                    self.io.write(f"{self.player.name} leveled up to level {level}!")
             
             # Reset item usage for the next enemy
             self.player.reset_item_usage()
             
             # Check if there are more enemies
             if self.encounters:
-                # Get next enemy
-                next_enemy_data = self.encounters.pop(0)
-                self.current_enemy = self.create_enemy(next_enemy_data)
-                self.logger.log_event(f"A wild {self.current_enemy.name} appears!")
+                self.spawn_next_enemy()
                 
                 # Reset turn counter for the new enemy
                 self.turn_count = 0
@@ -242,18 +310,52 @@ class Game:
                 self.logger.log_event("Congratulations! You've defeated all enemies!")
                 self.game_active = False
     
+    def play_turn(self) -> bool:
+        """
+        Play one round of combat: the player acts, then the enemy if it survived.
+        
+        Returns:
+            bool: True if the current enemy was defeated this round
+        """
+        self.turn_count += 1
+        
+        # Player's turn
+        self.player_turn()
+        
+        # Check if enemy was defeated
+        if not self.current_enemy.is_alive():
+            # Let listeners see the final blow before the next enemy appears
+            self.notify_turn_listeners()
+            self.check_victory()
+            return True
+        
+        # Enemy's turn
+        self.enemy_turn()
+        
+        # Check if player was defeated
+        if not self.player.is_alive():
+            self.game_active = False
+        
+        self.notify_turn_listeners()
+        return False
+    
+    def notify_turn_listeners(self):
+        """Tell every registered turn listener that a turn has been played."""
+        for listener in self.turn_listeners:
+            listener(self)
+    
     def game_over(self):
         """Handle game over scenario."""
         self.clear_screen()
         self.print_header("Game Over")
         
         if self.player and not self.player.is_alive():
-            print("You were defeated in battle...")
+            self.io.write("You were defeated in battle...")
         else:
-            print("Thanks for playing!")
+            self.io.write("Thanks for playing!")
         
-        print(f"\nYou reached level {self.player.level if self.player else 1}.")
-        press_enter()
+        self.io.write(f"\nYou reached level {self.player.level if self.player else 1}.")
+        self.io.pause()
     
     def run(self):
         """Main game loop."""
@@ -263,38 +365,24 @@ class Game:
             
             # Create first enemy
             if self.encounters:
-                first_enemy_data = self.encounters.pop(0)
-                self.current_enemy = self.create_enemy(first_enemy_data)
-                self.logger.log_event(f"A wild {self.current_enemy.name} appears!")
+                self.spawn_next_enemy()
+            else:
+                self.game_active = False  # Nothing to fight
             
             # Main game loop
             while self.game_active and self.player and self.player.is_alive():
-                self.turn_count += 1
-                
-                # Player's turn
-                self.player_turn()
-                
-                # Check if enemy was defeated
-                if not self.current_enemy.is_alive():
-                    self.check_victory()
-                    if not self.game_active:
-                        break
-                    press_enter()
-                    continue
-                
-                # Enemy's turn
-                self.enemy_turn()
+                enemy_defeated = self.play_turn()
                 
-                # Check if player was defeated
-                if not self.player.is_alive():
-                    self.game_active = False
-                    break
+                # Pause before the next enemy appears
+                if enemy_defeated and self.game_active:
+                    self.io.pause()
             
             # Game over
             self.game_over()
             
-        except KeyboardInterrupt:
-            print("\nGame interrupted. Thanks for playing!")
+        except (KeyboardInterrupt, EOFError):
+            self.io.write("\nGame interrupted. Thanks for playing!")
         except Exception as e:
-            print(f"\nAn error occurred: {e}")
-            print("The game will now exit.")
+            self.error = e
+            self.io.write(f"\nAn error occurred: {e}")
+            self.io.write("The game will now exit.")
@@ -0,0 +1,160 @@
+"""
+Input/output layer for the RPG game.
+
+The Game never calls input() or print() directly; it talks to an IO object.
+ConsoleIO is the normal interactive terminal. ScriptedIO feeds the game a
+recorded or generated script of answers and skips the "Press Enter" pauses,
+so the full UI path can be run at full speed in end-to-end tests.
+"""
+from typing import Callable, Iterable, List, Union
+
+from console_utils import clear_screen, format_header, press_enter
+
+
+class ConsoleIO:
+    """Reads from and writes to the terminal."""
+
+    def read(self, prompt: str) -> str:
+        """
+        Ask the user for a line of input.
+
+        Args:
+            prompt (str): Text shown before the input
+
+        Returns:
+            str: The line the user typed
+        """
+        return input(prompt)
+
+    def write(self, *values, sep: str = " "):
+        """
+        Show a line of output, like print().
+
+        Args:
+            *values: Values to show
+            sep (str, optional): Separator between values
+        """
+        print(*values, sep=sep)
+
+    def pause(self):
+        """Wait for the user to press Enter."""
+        press_enter()
+
+    def clear(self):
+        """Clear the screen."""
+        clear_screen()
+
+    def print_header(self, title: str):
+        """
+        Clear the screen and show a formatted header.
+
+        Args:
+            title (str): The title to display in the header
+        """
+        self.clear()
+        self.write(format_header(title))
+
+
+class ScriptedIO(ConsoleIO):
+    """
+    Plays a script of answers into the game without blocking.
+
+    Output is still rendered to text (so the display code is exercised) and
+    can optionally be kept for inspection. Pauses and screen clears are
+    skipped.
+    """
+
+    def __init__(self, script: Union[Iterable[str], Callable[[str], str]], capture: bool = False):
+        """
+        Initialise the scripted IO.
+
+        Args:
+            script (iterable or callable): Answers in order, or a function
+                that is given each prompt and returns the answer
+            capture (bool, optional): Whether to keep the rendered output
+        """
+        if callable(script):
+            self._answer = script
+        else:
+            answers = iter(script)
+            self._answer = lambda prompt: next(answers)
+        self.capture = capture
+        self.output: List[str] = []
+        self.prompts_answered = 0
+        self.ran_out = False  # True once the script ended before the game did
+
+    def read(self, prompt: str) -> str:
+        """
+        Return the next scripted answer.
+
+        Raises:
+            EOFError: If the script has run out, as input() would at end of file
+        """
+        self.write(prompt)
+        try:
+            answer = self._answer(prompt)
+        except StopIteration:
+            self.ran_out = True
+            raise EOFError("Script ran out of input") from None
+        self.prompts_answered += 1
+        return answer
+
+    def write(self, *values, sep: str = " "):
+        """Render the values to text and keep them if capturing."""
+        text = sep.join(map(str, values))
+        if self.capture:
+            self.output.append(text)
+
+    def pause(self):
+        """Skip the pause."""
+
+    def clear(self):
+        """Skip clearing the screen."""
+
+    @property
+    def transcript(self) -> str:
+        """Return the captured output as one string."""
+        return "\n".join(self.output)
+
+
+def play_scripted(script: Union[Iterable[str], Callable[[str], str]], capture: bool = False,
+                  streams=None, **game_options) -> ScriptedIO:
+    """
+    Play one complete interactive session from a script.
+
+    Game.run only prints unexpected errors, so they are raised again here
+    to make a broken end-to-end run fail loudly.
+
+    Args:
+        script (iterable or callable): Answers for every prompt, starting
+            with the character name
+        capture (bool, optional): Whether to keep the rendered output
+        streams (RollStreams, optional): Random streams for every roll,
+            including weapon crits and boss specials, so a recorded script
+            replays the same fight; see simulation.StreamedGame
+        **game_options: Extra arguments for Game, such as encounters or
+            rng (rng cannot be combined with streams)
+
+    Returns:
+        ScriptedIO: The IO used, with the transcript if captured; its
+            ran_out flag shows whether the script ended before the game did
+
+    Raises:
+        ValueError: If both rng and streams are given
+        Exception: Any unexpected error the game stopped on
+    """
+    from game import Game
+
+    if streams is not None and "rng" in game_options:
+        raise ValueError("Pass either rng or streams, not both; streams already drive every roll")
+
+    io = ScriptedIO(script, capture)
+    if streams is None:
+        game = Game(io=io, **game_options)
+    else:
+        from simulation import StreamedGame
+        game = StreamedGame(streams=streams, io=io, **game_options)
+    game.run()
+    if game.error is not None:
+        raise game.error
+    return io
@@ -5,7 +5,7 @@ This module handles all game logging functionality including combat events,
 character actions, and game state changes.
 """
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 class GameLogger:
     """
@@ -13,15 +13,17 @@ class GameLogger:
     
     This class demonstrates dependency relationship with the Game class.
     """
-    def __init__(self, log_to_console: bool = True):
+    def __init__(self, log_to_console: bool = True, output: Callable[[str], None] = print):
         """
         Initialize the game logger.
         
         Args:
             log_to_console (bool): Whether to print logs to console
+            output (callable, optional): Function used to show each log entry
         """
         self.logs = []
         self.log_to_console = log_to_console
+        self.output = output
     
     def log_event(self, message: str):
         """
@@ -34,7 +36,7 @@ class GameLogger:
         log_entry = f"[{timestamp}] {message}"
         self.logs.append(log_entry)
         if self.log_to_console:
-            print(log_entry)
+            self.output(log_entry)
     
     def log_combat(self, attacker, defender, damage: int):
         """
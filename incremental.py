@@ -0,0 +1,220 @@
+"""
+Incremental campaign re-simulation for the RPG game.
+
+When only a late encounter changes, the fights before it play out exactly as
+they did last time. This simulator records every sample's player state at
+each encounter boundary (right after Game.check_victory has granted XP and
+reset the items) and keys those states by a hash of the encounters that led
+there. Changing encounter K then only re-simulates encounters K onwards.
+
+Every (sample, encounter) pair plays on its own seeded roll streams, so
+resuming from a cached boundary gives the same result as a full re-run.
+"""
+import hashlib
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from boss_behaviours import compile_behaviour
+from game import Game
+from simulation import HeadlessGame, RollStreams, default_policy
+from weapon import Weapon
+
+# Outcome of a sample so far: "alive" (can fight on), "defeated", "fled" or "stalled"
+SampleState = Tuple[str, Dict[str, Any], Dict[str, Any]]
+
+
+def behaviour_description(encounter: Dict[str, Any]) -> Optional[str]:
+    """
+    Describe the boss behaviour an encounter would currently fight with.
+
+    The behaviour is resolved the way Boss does it, so a registered behaviour
+    whose spec (or one of whose on-hit effects) has been replaced gets a new
+    description even though its name stays the same.
+
+    Args:
+        encounter (dict): Encounter data in the Game.create_enemy format
+
+    Returns:
+        str: The full behaviour spec and effect functions, or None for
+            ordinary enemies
+    """
+    if not encounter.get("is_boss", False):
+        return None
+    compiled = compile_behaviour(encounter.get("behaviour"),
+                                 encounter.get("special_attack", "Special Attack"))
+    effects = [f"{effect.func.__module__}.{effect.func.__qualname__}" for effect in compiled.on_hit]
+    return repr((sorted(compiled.spec.items()), effects))
+
+
+def encounter_fingerprint(encounter: Dict[str, Any]) -> Tuple:
+    """
+    Reduce an encounter definition to the values that affect a fight.
+
+    Args:
+        encounter (dict): Encounter data in the Game.create_enemy format
+
+    Returns:
+        tuple: Description of the encounter, hashed through its repr
+    """
+    weapon = encounter["weapon"]
+    return (encounter["name"], encounter["health"], weapon.name, weapon.base_damage,
+            weapon.critical_chance, weapon.critical_multiplier,
+            encounter.get("special_attack", "Special Attack"), encounter.get("is_boss", False),
+            encounter.get("behaviour"), behaviour_description(encounter))
+
+
+def _fresh_encounter(fingerprint: Tuple) -> Dict[str, Any]:
+    """Build a new encounter from a fingerprint, with its own Weapon."""
+    name, health, weapon_name, damage, chance, multiplier, special, is_boss, behaviour, _ = fingerprint
+    return {
+        "name": name,
+        "health": health,
+        "weapon": Weapon(weapon_name, damage, chance, multiplier),
+        "special_attack": special,
+        "is_boss": is_boss,
+        "behaviour": behaviour,
+    }
+
+
+class IncrementalCampaignSimulator:
+    """
+    Simulates a campaign for many samples, reusing cached campaign prefixes.
+    """
+
+    def __init__(self, samples: int = 1000, seed: int = 0,
+                 policy: Callable[[Game], str] = default_policy, max_turns: int = 1000):
+        """
+        Initialise the simulator.
+
+        Args:
+            samples (int, optional): Number of simulated players
+            seed (int, optional): Base seed for all roll streams
+            policy (callable, optional): Chooses the player's menu action
+            max_turns (int, optional): Turn cap per encounter
+        """
+        self.samples = samples
+        self.seed = seed
+        self.policy = policy
+        self.max_turns = max_turns
+        self._cache: Dict[str, List[SampleState]] = {}
+        self.encounters_simulated = 0
+        self.encounters_reused = 0
+
+    def _prefix_keys(self, fingerprints: List[Tuple]) -> List[str]:
+        """Return the cache key after each prefix of the campaign (key 0 is empty)."""
+        policy_name = f"{self.policy.__module__}.{self.policy.__qualname__}"
+        digest = hashlib.sha256(repr((self.samples, self.seed, policy_name, self.max_turns)).encode())
+        keys = [digest.hexdigest()]
+        for fingerprint in fingerprints:
+            digest.update(repr(fingerprint).encode())
+            keys.append(digest.hexdigest())
+        return keys
+
+    def _fight(self, state: Optional[SampleState], fingerprint: Tuple,
+               sample: int, index: int) -> SampleState:
+        """Play one sample through one encounter and return its new state."""
+        if state is not None and state[0] != "alive":
+            return state
+
+        streams = RollStreams(f"{self.seed}:{sample}:{index}")
+        game = HeadlessGame([_fresh_encounter(fingerprint)], self.policy, streams)
+        player = game.create_player("Hero")
+        if state is not None:
+            player.__dict__.update(state[1])
+            player.weapon.__dict__.update(state[2])
+        game.spawn_next_enemy()
+
+        status = "stalled"
+        for _ in range(self.max_turns):
+            if game.play_turn():
+                status = "alive"
+                break
+            if not player.is_alive():
+                status = "defeated"
+                break
+            if not game.game_active:
+                status = "fled"
+                break
+
+        player_state = {key: value for key, value in vars(player).items() if key != "weapon"}
+        weapon_state = {key: value for key, value in vars(player.weapon).items()
+                        if key not in ("rng", "damage_rows")}
+        return status, player_state, weapon_state
+
+    def run(self, encounters: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Simulate the campaign, reusing the longest cached prefix.
+
+        Args:
+            encounters (list): Encounter definitions in play order; they are
+                only read, never mutated
+
+        Returns:
+            dict: "boundaries" (a summary after each encounter, see
+                summarise), "reused" (encounters taken from the cache) and
+                "won" (samples that cleared every encounter)
+        """
+        fingerprints = [encounter_fingerprint(encounter) for encounter in encounters]
+        keys = self._prefix_keys(fingerprints)
+
+        start = 0
+        for index in range(len(fingerprints), 0, -1):
+            if keys[index] in self._cache:
+                start = index
+                break
+        self.encounters_reused += start
+
+        for index in range(start, len(fingerprints)):
+            previous = self._cache[keys[index]] if index else [None] * self.samples
+            self._cache[keys[index + 1]] = [
+                self._fight(state, fingerprints[index], sample, index)
+                for sample, state in enumerate(previous)
+            ]
+            self.encounters_simulated += 1
+
+        boundaries = [self.summarise(self._cache[key]) for key in keys[1:]]
+        return {
+            "boundaries": boundaries,
+            "reused": start,
+            "won": boundaries[-1]["status_counts"].get("alive", 0) if boundaries else self.samples,
+        }
+
+    @staticmethod
+    def summarise(states: List[SampleState]) -> Dict[str, Any]:
+        """
+        Summarise the player-state distribution at one encounter boundary.
+
+        Args:
+            states (list): Sample states after an encounter
+
+        Returns:
+            dict: status_counts, level_counts, and the mean health,
+                experience and weapon damage of the surviving samples
+        """
+        survivors = [state for state in states if state[0] == "alive"]
+        count = len(survivors) or 1
+        return {
+            "status_counts": dict(Counter(state[0] for state in states)),
+            "level_counts": dict(sorted(Counter(state[1]["level"] for state in survivors).items())),
+            "mean_health": sum(state[1]["_health"] for state in survivors) / count,
+            "mean_experience": sum(state[1]["experience"] for state in survivors) / count,
+            "mean_weapon_damage": sum(state[2]["base_damage"] for state in survivors) / count,
+        }
+
+    def clear(self):
+        """Forget every cached prefix."""
+        self._cache.clear()
+
+
+if __name__ == "__main__":
+    import time
+    from encounters import default_campaign
+
+    simulator = IncrementalCampaignSimulator(samples=2000)
+    for dragon_health in (100, 90, 80):
+        campaign = default_campaign()
+        campaign[-1]["health"] = dragon_health
+        started = time.perf_counter()
+        outcome = simulator.run(campaign)
+        print(f"Dragon health {dragon_health}: won {outcome['won']}/{simulator.samples}, "
+              f"reused {outcome['reused']} encounters, {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,332 @@
+"""
+Resumable, checkpointed simulation jobs for the RPG game.
+
+A job simulates many headless campaigns and splits them into seeded shards.
+Every completed shard, and the partial progress of the shard being worked
+on, is written atomically to a checkpoint directory. If the job is stopped
+it can be started again with the same settings and carries on from the last
+checkpoint, giving exactly the same final result as an uninterrupted run.
+
+Several local worker processes can share one job: each claims a shard by
+taking an operating system lock on the shard's lock file, and the final merge
+only reads complete shard files. The operating system drops the lock when a
+worker exits or dies, so a crashed worker's shard is simply claimed again.
+"""
+import json
+import multiprocessing
+import os
+import tempfile
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from encounters import default_campaign
+from simulation import default_policy, simulate_campaign
+
+
+def atomic_write_json(path: str, data: Dict[str, Any]):
+    """
+    Write JSON so that readers only ever see the old or the new file.
+
+    Args:
+        path (str): Destination file
+        data (dict): Data to write
+    """
+    directory = os.path.dirname(path) or "."
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "w") as temp_file:
+            json.dump(data, temp_file, sort_keys=True)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def empty_aggregate() -> Dict[str, Any]:
+    """
+    Create an aggregate with no campaigns in it.
+
+    Returns:
+        dict: Running totals for a set of campaigns
+    """
+    return {
+        "campaigns": 0,
+        "won": 0,
+        "fled": 0,
+        "total_level": 0,
+        "total_turns": 0,
+        "total_encounters_cleared": 0,
+        "level_counts": {},
+    }
+
+
+def add_result(aggregate: Dict[str, Any], result: Dict[str, Any]):
+    """
+    Add one campaign outcome to an aggregate.
+
+    Args:
+        aggregate (dict): Totals to update in place
+        result (dict): Outcome from simulate_campaign
+    """
+    aggregate["campaigns"] += 1
+    aggregate["won"] += int(result["won"])
+    aggregate["fled"] += int(result["fled"])
+    aggregate["total_level"] += result["level"]
+    aggregate["total_turns"] += result["turns"]
+    aggregate["total_encounters_cleared"] += result["encounters_cleared"]
+    # JSON object keys are strings, so keep them as strings throughout
+    level = str(result["level"])
+    aggregate["level_counts"][level] = aggregate["level_counts"].get(level, 0) + 1
+
+
+def merge_aggregates(target: Dict[str, Any], source: Dict[str, Any]):
+    """
+    Add the totals of one aggregate into another.
+
+    Args:
+        target (dict): Totals to update in place
+        source (dict): Totals to add
+    """
+    for key, value in source.items():
+        if key == "level_counts":
+            for level, count in value.items():
+                target[key][level] = target[key].get(level, 0) + count
+        else:
+            target[key] += value
+
+
+def _try_lock(handle: int) -> bool:
+    """Take a non-blocking exclusive lock on an open file, returning True on success."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(handle, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(handle: int):
+    """Release a lock taken with _try_lock and close the file."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+        else:
+            os.lseek(handle, 0, os.SEEK_SET)
+            msvcrt.locking(handle, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(handle)
+
+
+def _qualified_name(function: Callable) -> str:
+    """Return module.name for a function, used to check a resumed job matches."""
+    return f"{function.__module__}.{function.__qualname__}"
+
+
+class SimulationJob:
+    """
+    A long-running batch of headless campaigns, checkpointed to a directory.
+
+    Campaign i always uses seed + i, so any shard can be (re)computed on its
+    own and the merged result does not depend on how the work was split.
+    """
+
+    def __init__(self, directory: str, campaigns: int, shard_size: int = 1000, seed: int = 0,
+                 make_encounters: Callable[[], Any] = default_campaign,
+                 policy: Callable = default_policy, checkpoint_every: int = 100):
+        """
+        Initialise the job and its checkpoint directory.
+
+        Args:
+            directory (str): Checkpoint directory (created if missing)
+            campaigns (int): Total number of campaigns to simulate
+            shard_size (int, optional): Campaigns per shard
+            seed (int, optional): Seed of the first campaign
+            make_encounters (callable, optional): Module-level function that
+                builds the encounters for one campaign
+            policy (callable, optional): Module-level player policy
+            checkpoint_every (int, optional): Campaigns between partial
+                checkpoints inside a shard
+
+        Raises:
+            ValueError: If the directory holds a job with different settings
+        """
+        self.directory = directory
+        self.campaigns = campaigns
+        self.shard_size = shard_size
+        self.seed = seed
+        self.make_encounters = make_encounters
+        self.policy = policy
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.shard_count = (campaigns + shard_size - 1) // shard_size
+
+        os.makedirs(directory, exist_ok=True)
+        self._check_manifest()
+
+    def _check_manifest(self):
+        """Write the job manifest, or check it matches an existing one."""
+        manifest = {
+            "campaigns": self.campaigns,
+            "shard_size": self.shard_size,
+            "seed": self.seed,
+            "make_encounters": _qualified_name(self.make_encounters),
+            "policy": _qualified_name(self.policy),
+        }
+        path = os.path.join(self.directory, "manifest.json")
+        if os.path.exists(path):
+            with open(path) as manifest_file:
+                existing = json.load(manifest_file)
+            if existing != manifest:
+                raise ValueError(f"Checkpoint directory {self.directory} belongs to a different job")
+        else:
+            atomic_write_json(path, manifest)
+
+    def _shard_path(self, shard: int, suffix: str = "json") -> str:
+        """Return the path of a shard's file with the given suffix."""
+        return os.path.join(self.directory, f"shard-{shard:05d}.{suffix}")
+
+    def pending_shards(self) -> List[int]:
+        """
+        List the shards that have not been completed yet.
+
+        Returns:
+            list: Shard numbers without a completed shard file
+        """
+        return [shard for shard in range(self.shard_count)
+                if not os.path.exists(self._shard_path(shard))]
+
+    def _claim(self, shard: int) -> Optional[int]:
+        """
+        Try to take the lock for a shard.
+
+        Lock files stay in place while the job runs, so there is no window in
+        which two workers can lock different files for the same shard. A lock
+        held by a worker that has died is released by the operating system.
+
+        Returns:
+            int: Handle of the locked file, to pass to _unlock, or None if
+                another worker owns the shard
+        """
+        handle = os.open(self._shard_path(shard, "lock"), os.O_CREAT | os.O_RDWR)
+        if _try_lock(handle):
+            return handle
+        os.close(handle)
+        return None
+
+    def run_shard(self, shard: int) -> Dict[str, Any]:
+        """
+        Simulate one shard, resuming from its partial checkpoint if there is one.
+
+        Args:
+            shard (int): Shard number
+
+        Returns:
+            dict: The shard's aggregate
+        """
+        partial_path = self._shard_path(shard, "partial.json")
+        first = self.seed + shard * self.shard_size
+        last = min(self.seed + self.campaigns, first + self.shard_size)
+
+        next_seed = first
+        aggregate = empty_aggregate()
+        if os.path.exists(partial_path):
+            with open(partial_path) as partial_file:
+                partial = json.load(partial_file)
+            next_seed = partial["next_seed"]
+            aggregate = partial["aggregate"]
+
+        for campaign_seed in range(next_seed, last):
+            add_result(aggregate, simulate_campaign(campaign_seed, self.make_encounters, self.policy))
+            done = campaign_seed + 1
+            if done < last and (done - first) % self.checkpoint_every == 0:
+                atomic_write_json(partial_path, {"next_seed": done, "aggregate": aggregate})
+
+        atomic_write_json(self._shard_path(shard), aggregate)
+        try:
+            os.remove(partial_path)
+        except FileNotFoundError:
+            pass
+        return aggregate
+
+    def work(self):
+        """Claim and run pending shards until none are left to claim."""
+        for shard in self.pending_shards():
+            handle = self._claim(shard)
+            if handle is None:
+                continue
+            try:
+                # Another worker may have finished it between listing and claiming
+                if not os.path.exists(self._shard_path(shard)):
+                    self.run_shard(shard)
+            finally:
+                _unlock(handle)
+
+    def merge(self) -> Dict[str, Any]:
+        """
+        Combine all completed shards and write the job result.
+
+        Once every shard is complete the lock files are no longer needed and
+        are removed.
+
+        Returns:
+            dict: Aggregate over every campaign, plus a "complete" flag that
+                is False while shards are still missing
+        """
+        result = empty_aggregate()
+        missing = 0
+        for shard in range(self.shard_count):
+            path = self._shard_path(shard)
+            if not os.path.exists(path):
+                missing += 1
+                continue
+            with open(path) as shard_file:
+                merge_aggregates(result, json.load(shard_file))
+
+        result["complete"] = missing == 0
+        if result["complete"]:
+            atomic_write_json(os.path.join(self.directory, "result.json"), result)
+            for shard in range(self.shard_count):
+                try:
+                    os.remove(self._shard_path(shard, "lock"))
+                except OSError:
+                    pass  # Already gone, or still open in a late worker on Windows
+        return result
+
+    def run(self, workers: int = 1) -> Dict[str, Any]:
+        """
+        Run (or resume) the whole job and merge the results.
+
+        Args:
+            workers (int, optional): Number of local worker processes
+
+        Returns:
+            dict: The merged result from merge()
+        """
+        if workers <= 1:
+            self.work()
+        else:
+            processes = [multiprocessing.Process(target=self.work) for _ in range(workers)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+        return self.merge()
+
+
+if __name__ == "__main__":
+    import sys
+
+    checkpoint_dir = sys.argv[1] if len(sys.argv) > 1 else "simulation_checkpoints"
+    job = SimulationJob(checkpoint_dir, campaigns=20_000, shard_size=1000)
+    print(f"{len(job.pending_shards())} of {job.shard_count} shards left")
+    summary = job.run(workers=os.cpu_count() or 1)
+    print(json.dumps(summary, indent=2, sort_keys=True))
@@ -0,0 +1,246 @@
+"""
+Object pooling for simulations of the RPG game.
+
+Simulations create an enemy for every encounter, and a player, a starting
+weapon and a whole encounter list for every campaign. At millions of battles
+that allocation churn shows up in the runtime, so this module keeps released
+Character, Boss and Weapon objects and resets them in place instead of
+building new ones, and builds each campaign's encounter templates only once.
+
+Run this module directly for a campaign benchmark with and without a pool.
+
+Pooling bounds allocation; it does not make simulations faster. CPython frees
+short-lived objects immediately through reference counting, and reset()
+re-runs the constructors, so on CPython 3.11 the pooled path measured about
+5-10% slower (best of 5 over 3000 campaigns: 0.96s fresh, 1.03s pooled),
+with no garbage collections on either side. Only turn pool= on to keep
+allocation flat, for example alongside a lot of other live data.
+"""
+from typing import Any, Callable, Dict, List
+
+from boss import Boss
+from character import Character
+from weapon import Weapon
+
+
+class EntityPool:
+    """
+    Hands out recycled characters, bosses and weapons.
+
+    Acquired entities are reset through their reset() methods, which re-run
+    the constructors in place, so a pooled entity behaves exactly like a
+    freshly constructed one.
+    """
+
+    def __init__(self, characters: int = 0, bosses: int = 0):
+        """
+        Initialise the pool, optionally pre-allocating entities.
+
+        Args:
+            characters (int, optional): Ordinary characters to pre-allocate
+            bosses (int, optional): Bosses to pre-allocate
+        """
+        self._free_weapons: List[Weapon] = []
+        self._free_characters: List[Character] = []
+        self._free_bosses: List[Boss] = []
+        self._templates: Dict[Callable[[], Any], List[Dict[str, Any]]] = {}
+        self.created = 0
+        self.reused = 0
+
+        for _ in range(characters):
+            self.release(Character("", 1, Weapon("", 0)))
+        for _ in range(bosses):
+            self.release(Boss("", 1, Weapon("", 0), ""))
+        self.created += 2 * (characters + bosses)
+
+    def acquire_weapon(self, template: Weapon) -> Weapon:
+        """
+        Get a weapon with the base stats of a template weapon.
+
+        Args:
+            template (Weapon): Weapon whose stats are copied (it is not changed)
+
+        Returns:
+            Weapon: A pooled or new weapon
+        """
+        return self.acquire_weapon_stats(template.name, template.base_damage,
+                                         template.critical_chance, template.critical_multiplier)
+
+    def acquire_weapon_stats(self, name: str, base_damage: int, critical_chance: float = 0.1,
+                             critical_multiplier: float = 2.0) -> Weapon:
+        """
+        Get a weapon, as Weapon(name, base_damage, ...) would.
+
+        Args:
+            name (str): Name of the weapon
+            base_damage (int): Base damage of the weapon
+            critical_chance (float, optional): Chance of a critical hit
+            critical_multiplier (float, optional): Critical hit damage multiplier
+
+        Returns:
+            Weapon: A pooled or new weapon
+        """
+        if self._free_weapons:
+            weapon = self._free_weapons.pop()
+            weapon.reset(name, base_damage, critical_chance, critical_multiplier)
+            self.reused += 1
+            return weapon
+
+        self.created += 1
+        return Weapon(name, base_damage, critical_chance, critical_multiplier)
+
+    def acquire_character(self, name: str, max_health: int, weapon: Weapon) -> Character:
+        """
+        Get an ordinary character, as Character(name, max_health, weapon) would.
+
+        Args:
+            name (str): Character's name
+            max_health (int): Maximum health points
+            weapon (Weapon): The weapon to equip
+
+        Returns:
+            Character: A pooled or new character
+        """
+        if self._free_characters:
+            character = self._free_characters.pop()
+            character.reset(name, max_health, weapon)
+            self.reused += 1
+            return character
+
+        self.created += 1
+        return Character(name, max_health, weapon)
+
+    def acquire_boss(self, name: str, max_health: int, weapon: Weapon,
+                     special_attack: str, behaviour=None) -> Boss:
+        """
+        Get a boss, as Boss(name, max_health, weapon, special_attack) would.
+
+        Args:
+            name (str): Boss's name
+            max_health (int): Maximum health points
+            weapon (Weapon): The boss's weapon, at its base stats
+            special_attack (str): Name of the boss's special attack
+            behaviour (optional): Boss behaviour, as accepted by Boss
+
+        Returns:
+            Boss: A pooled or new boss
+        """
+        if self._free_bosses:
+            boss = self._free_bosses.pop()
+            boss.reset(name, max_health, weapon, special_attack, behaviour=behaviour)
+            self.reused += 1
+            return boss
+
+        self.created += 1
+        return Boss(name, max_health, weapon, special_attack, behaviour=behaviour)
+
+    def acquire_enemy(self, enemy_data: Dict[str, Any]) -> Character:
+        """
+        Get an enemy for an encounter, mirroring Game.create_enemy.
+
+        The encounter's weapon is used as a template, so the encounter data
+        can be reused for many battles.
+
+        Args:
+            enemy_data (dict): Encounter data in the Game.create_enemy format
+
+        Returns:
+            Character: A pooled or new Character or Boss
+        """
+        weapon = self.acquire_weapon(enemy_data["weapon"])
+        if enemy_data.get("is_boss", False):
+            return self.acquire_boss(enemy_data["name"], enemy_data["health"], weapon,
+                                     enemy_data.get("special_attack", "Special Attack"),
+                                     enemy_data.get("behaviour"))
+        return self.acquire_character(enemy_data["name"], enemy_data["health"], weapon)
+
+    def encounter_templates(self, make_encounters: Callable[[], Any]) -> Any:
+        """
+        Get the encounters for a campaign, building them once per builder.
+
+        Pooled enemies only read encounter data, so a list built by a
+        deterministic builder can serve every campaign. Builders that return
+        an EncounterSource (which is used up as it is played) are called
+        every time.
+
+        Args:
+            make_encounters (callable): Builds a campaign's encounters
+
+        Returns:
+            list or EncounterSource: Encounter data; lists must not be changed
+        """
+        templates = self._templates.get(make_encounters)
+        if templates is None:
+            templates = make_encounters()
+            if not isinstance(templates, list):
+                return templates
+            self._templates[make_encounters] = templates
+        return templates
+
+    def release(self, entity: Character):
+        """
+        Return a character (and its weapon) to the pool.
+
+        The caller must not use the entity again after releasing it.
+
+        Args:
+            entity (Character): The Character or Boss to recycle
+        """
+        if entity.weapon is not None:
+            self._free_weapons.append(entity.weapon)
+        if isinstance(entity, Boss):
+            self._free_bosses.append(entity)
+        else:
+            self._free_characters.append(entity)
+
+
+def _benchmark(campaigns: int = 3_000, repeats: int = 5):
+    """Compare allocations and time for simulate_campaign with and without a pool."""
+    import gc
+    import time
+    import tracemalloc
+    from simulation import RollStreams, simulate_campaign
+
+    pool = EntityPool()
+    streams = RollStreams(0)
+
+    def fresh():
+        for seed in range(campaigns):
+            simulate_campaign(seed, streams=streams)
+
+    def pooled():
+        for seed in range(campaigns):
+            simulate_campaign(seed, pool=pool, streams=streams)
+
+    pooled()  # Warm the pool and the encounter templates
+    created = pool.created
+    pooled()
+    print(f"pooled: {pool.created - created} entities constructed for {campaigns} campaigns "
+          f"after warm-up ({pool.reused} reused in total)")
+    print(f" fresh: about {campaigns * 8} entities constructed "
+          f"(player, starting weapon, 3 encounter weapons, 3 enemies per campaign)")
+
+    # Interleave the runs and keep the best time, as combat dominates and is noisy
+    best = {"fresh": float("inf"), "pooled": float("inf")}
+    collections = {"fresh": 0, "pooled": 0}
+    for _ in range(repeats):
+        for label, run in (("fresh", fresh), ("pooled", pooled)):
+            gc.collect()
+            collections_before = sum(stat["collections"] for stat in gc.get_stats())
+            start = time.perf_counter()
+            run()
+            best[label] = min(best[label], time.perf_counter() - start)
+            collections[label] += sum(stat["collections"] for stat in gc.get_stats()) - collections_before
+
+    for label, run in (("fresh", fresh), ("pooled", pooled)):
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{label:>6}: best {best[label]:.3f}s of {repeats} for {campaigns} campaigns, "
+              f"{collections[label]} GC collections, peak traced memory {peak / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    _benchmark()
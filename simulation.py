@@ -0,0 +1,434 @@
+"""
+Headless campaign simulation for the RPG game.
+
+This module plays the real Game rules without any console input or output so
+that balance changes can be measured over thousands of campaigns. It also
+provides an A/B mode that compares two balance variants on common random
+numbers, with optional antithetic pairing, and reports the paired difference
+with a confidence interval.
+"""
+import math
+import random
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from character import Character
+from damage_tables import DamageTableCache
+from encounters import default_campaign
+from game import Game
+from game_logger import GameLogger
+from pooling import EntityPool
+
+# Roll categories that can be paired antithetically, mapped to their streams
+ANTITHETIC_STREAMS = {
+    "crit": ("player_crit", "enemy_crit"),
+    "special": ("boss",),
+    "run": ("escape",),
+}
+
+
+class AntitheticRandom(random.Random):
+    """
+    Random generator that returns 1 - u for every uniform draw u.
+
+    Seeded the same as a plain random.Random, it mirrors that generator's
+    rolls: a critical hit that was likely becomes unlikely and vice versa.
+    """
+
+    def random(self) -> float:
+        """Return the antithetic counterpart of the next uniform draw."""
+        return 1.0 - super().random()
+
+
+class RollStreams:
+    """
+    Independent random streams for each kind of roll in a campaign.
+
+    Giving every roll category its own stream keeps two variants in step: a
+    change that adds an extra crit roll does not shift the enemy AI rolls.
+    """
+
+    NAMES = ("player_crit", "enemy_crit", "boss", "game", "escape")
+
+    def __init__(self, seed: int, antithetic: Iterable[str] = ()):
+        """
+        Initialise one generator per stream.
+
+        Args:
+            seed (int): Seed shared by every variant of this replicate
+            antithetic (iterable, optional): Roll categories from
+                ANTITHETIC_STREAMS to draw antithetically
+        """
+        flipped = set()
+        for category in antithetic:
+            if category not in ANTITHETIC_STREAMS:
+                raise ValueError(f"Unknown antithetic roll category: {category}")
+            flipped.update(ANTITHETIC_STREAMS[category])
+
+        for name in self.NAMES:
+            stream_class = AntitheticRandom if name in flipped else random.Random
+            setattr(self, name, stream_class(f"{seed}:{name}"))
+
+    def reseed(self, seed: int):
+        """
+        Reseed every stream in place, as if newly created with this seed.
+
+        Lets a worker reuse one set of generators for many campaigns.
+
+        Args:
+            seed (int): New replicate seed
+        """
+        for name in self.NAMES:
+            getattr(self, name).seed(f"{seed}:{name}")
+
+
+class SilentLogger(GameLogger):
+    """Logger that discards every event, for simulations."""
+
+    def __init__(self):
+        """Initialise the logger with console output turned off."""
+        super().__init__(log_to_console=False)
+
+    def log_event(self, message: str):
+        """Discard the event."""
+
+
+def default_policy(game: Game) -> str:
+    """
+    Choose the player's action: drink the health potion when low, else attack.
+
+    Args:
+        game (Game): The game being simulated
+
+    Returns:
+        str: Menu choice, as typed at the "Choose an action" prompt
+    """
+    player = game.player
+    if player.health < player.max_health * 0.4 and not player.health_bonus_used:
+        return "3"
+    return "1"
+
+
+def cautious_policy(game: Game) -> str:
+    """
+    Like default_policy, but try to run from ordinary enemies when in danger.
+
+    Args:
+        game (Game): The game being simulated
+
+    Returns:
+        str: Menu choice, as typed at the "Choose an action" prompt
+    """
+    player = game.player
+    if (player.health < player.max_health * 0.25 and player.health_bonus_used
+            and not game.current_enemy.is_boss):
+        return "5"
+    return default_policy(game)
+
+
+class StreamedGame(Game):
+    """
+    Game whose every roll comes from a RollStreams set.
+
+    The player's crits, the enemies' crits, boss specials, the enemy AI and
+    run-away rolls each use their own stream, so the same seed replays the
+    same fight.
+    """
+
+    def __init__(self, encounters=None, streams: Optional[RollStreams] = None,
+                 logger: Optional[GameLogger] = None, io=None):
+        """
+        Initialise a game on a set of roll streams.
+
+        Args:
+            encounters (EncounterSource or list, optional): Enemies to fight
+            streams (RollStreams, optional): Random streams for all rolls
+            logger (GameLogger, optional): Logger for game events
+            io (ConsoleIO, optional): Where input comes from and output goes
+        """
+        self.streams = streams if streams is not None else RollStreams(0)
+        super().__init__(encounters, logger=logger, rng=self.streams.game, io=io)
+        self.escape_rng = self.streams.escape
+
+    def attach_streams(self, character: Character, crit_stream: random.Random):
+        """
+        Point a character's rolls at the game's streams.
+
+        Args:
+            character (Character): Player or enemy
+            crit_stream (random.Random): Stream for the character's weapon
+        """
+        character.weapon.rng = crit_stream
+        if character.is_boss:
+            character.rng = self.streams.boss
+
+    def create_player(self, player_name: str) -> Character:
+        """Create the player and hook its weapon up to the player crit stream."""
+        player = super().create_player(player_name)
+        self.attach_streams(player, self.streams.player_crit)
+        return player
+
+    def create_enemy(self, enemy_data: Dict[str, Any]) -> Character:
+        """Create the enemy and hook it up to the enemy streams."""
+        enemy = super().create_enemy(enemy_data)
+        self.attach_streams(enemy, self.streams.enemy_crit)
+        return enemy
+
+
+class HeadlessGame(StreamedGame):
+    """
+    Game that plays itself using a policy instead of console input.
+
+    Only the input and pauses are replaced; every combat rule comes from Game.
+    """
+
+    def __init__(self, encounters=None, policy: Callable[[Game], str] = default_policy,
+                 streams: Optional[RollStreams] = None, pool: Optional[EntityPool] = None,
+                 damage_tables: Optional[DamageTableCache] = None):
+        """
+        Initialise a headless game.
+
+        Args:
+            encounters (EncounterSource or list, optional): Enemies to fight
+            policy (callable, optional): Chooses the player's menu action
+            streams (RollStreams, optional): Random streams for all rolls
+            pool (EntityPool, optional): Recycles the player and enemies
+                between encounters and campaigns; encounter weapons are then
+                only used as templates
+            damage_tables (DamageTableCache, optional): Resolves normal hits
+                from precomputed tables; outcomes are unchanged
+        """
+        super().__init__(encounters, streams, logger=SilentLogger())
+        self.policy = policy
+        self.pool = pool
+        self.damage_tables = damage_tables
+
+    def build_player(self, player_name: str) -> Character:
+        """Construct (or recycle) the player and its starting weapon."""
+        if self.pool is None:
+            return super().build_player(player_name)
+        weapon = self.pool.acquire_weapon_stats(*self.STARTING_WEAPON)
+        return self.pool.acquire_character(player_name, self.PLAYER_MAX_HEALTH, weapon)
+
+    def create_enemy(self, enemy_data: Dict[str, Any]) -> Character:
+        """Create (or recycle) the enemy and hook it up to the enemy streams."""
+        if self.pool is None:
+            return super().create_enemy(enemy_data)
+        # The previous enemy is about to be replaced, so recycle it
+        if self.current_enemy is not None:
+            self.pool.release(self.current_enemy)
+            self.current_enemy = None
+        enemy = self.pool.acquire_enemy(enemy_data)
+        self.attach_streams(enemy, self.streams.enemy_crit)
+        return enemy
+
+    def perform_attack(self, attacker: Character, target: Character) -> int:
+        """Resolve the attack from the damage tables when possible."""
+        if self.damage_tables is None or attacker.is_boss:
+            return attacker.attack(target)
+        return self.damage_tables.attack(attacker, target)
+
+    def player_turn(self):
+        """Let the policy pick the player's action."""
+        if not self.player or not self.current_enemy:
+            return
+        if not self.resolve_player_action(self.policy(self)):
+            raise ValueError("Policy returned an invalid menu choice")
+
+    def enemy_turn(self):
+        """Resolve the enemy's action without pausing."""
+        if not self.player or not self.current_enemy:
+            return
+        if self.current_enemy.is_alive():
+            self.resolve_enemy_action()
+
+    def play(self, player_name: str = "Hero", max_turns: int = 10_000) -> Dict[str, Any]:
+        """
+        Play a whole campaign.
+
+        Args:
+            player_name (str, optional): Name of the simulated player
+            max_turns (int, optional): Safety cap for endless encounter sources
+
+        With a pool, the player and the last enemy go back to the pool once
+        the outcome has been recorded.
+
+        Returns:
+            dict: Outcome with keys won, fled, level, encounters_cleared, turns
+        """
+        self.create_player(player_name)
+        if self.encounters:
+            self.spawn_next_enemy()
+        else:
+            self.game_active = False  # Nothing to fight
+
+        encounters_cleared = 0
+        turns = 0
+        while self.game_active and self.player.is_alive() and turns < max_turns:
+            turns += 1
+            if self.play_turn():
+                encounters_cleared += 1
+
+        enemy_alive = self.current_enemy is not None and self.current_enemy.is_alive()
+        result = {
+            "won": self.player.is_alive() and not enemy_alive,
+            "fled": self.player.is_alive() and enemy_alive and not self.game_active,
+            "level": self.player.level,
+            "encounters_cleared": encounters_cleared,
+            "turns": turns,
+        }
+
+        if self.pool is not None:
+            if self.current_enemy is not None:
+                self.pool.release(self.current_enemy)
+                self.current_enemy = None
+            self.pool.release(self.player)
+            self.player = None
+        return result
+
+
+def simulate_campaign(seed: int, make_encounters: Callable[[], Any] = default_campaign,
+                      policy: Callable[[Game], str] = default_policy,
+                      antithetic: Iterable[str] = (),
+                      pool: Optional[EntityPool] = None,
+                      streams: Optional[RollStreams] = None,
+                      damage_tables: Optional[DamageTableCache] = None) -> Dict[str, Any]:
+    """
+    Simulate one campaign on the streams for a seed.
+
+    Args:
+        seed (int): Replicate seed
+        make_encounters (callable, optional): Builds a fresh encounter list or
+            source; called once per campaign because bosses mutate weapons,
+            or only once per pool when a pool is given and it returns a list
+        policy (callable, optional): Chooses the player's menu action
+        antithetic (iterable, optional): Roll categories to draw antithetically
+        pool (EntityPool, optional): Pool to recycle the player, enemies and
+            encounter templates through
+        streams (RollStreams, optional): Existing streams to reseed and reuse
+            instead of creating new ones (antithetic is then ignored)
+        damage_tables (DamageTableCache, optional): Tables to resolve normal
+            hits from
+
+    Returns:
+        dict: Campaign outcome from HeadlessGame.play
+    """
+    if streams is None:
+        streams = RollStreams(seed, antithetic)
+    else:
+        streams.reseed(seed)
+    encounters = make_encounters() if pool is None else pool.encounter_templates(make_encounters)
+    game = HeadlessGame(encounters, policy, streams, pool, damage_tables)
+    return game.play()
+
+
+def _replicate_value(seed: int, make_encounters, policy, metric: str,
+                     antithetic: List[str]) -> float:
+    """Return the metric for one replicate, averaged with its antithetic twin."""
+    value = float(simulate_campaign(seed, make_encounters, policy)[metric])
+    if not antithetic:
+        return value
+    twin = float(simulate_campaign(seed, make_encounters, policy, antithetic)[metric])
+    return (value + twin) / 2
+
+
+def _variance(values: List[float]) -> float:
+    """Return the sample variance of a list of values."""
+    mean = sum(values) / len(values)
+    return sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+
+
+def _normal_quantile(probability: float) -> float:
+    """Return z such that a standard normal variable is below z with this probability."""
+    low, high = -10.0, 10.0
+    for _ in range(100):  # Bisection on the normal CDF, far past float precision
+        middle = (low + high) / 2
+        if 0.5 * (1 + math.erf(middle / math.sqrt(2))) < probability:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+def compare_variants(make_encounters_a: Callable[[], Any], make_encounters_b: Callable[[], Any],
+                     replicates: int = 1000, seed: int = 0, metric: str = "turns",
+                     policy: Callable[[Game], str] = default_policy,
+                     antithetic: Iterable[str] = (),
+                     confidence: float = 0.95) -> Dict[str, float]:
+    """
+    Compare two balance variants using common random numbers.
+
+    Replicate i of both variants runs on the same roll streams, so the paired
+    difference cancels most of the luck that independent runs would leave in.
+
+    Args:
+        make_encounters_a (callable): Builds the encounters for variant A
+        make_encounters_b (callable): Builds the encounters for variant B
+        replicates (int, optional): Number of paired replicates (at least 2)
+        seed (int, optional): Base seed; replicate i uses seed + i
+        metric (str, optional): Outcome key to compare, e.g. "turns", "won"
+            or "level"
+        policy (callable, optional): Chooses the player's menu action
+        antithetic (iterable, optional): Roll categories ("crit", "special",
+            "run") to pair antithetically within each replicate
+        confidence (float, optional): Confidence level for the interval
+
+    Returns:
+        dict: mean_a, mean_b, difference (A - B), std_error, ci_low, ci_high,
+            independent_std_error (what unpaired runs would have given) and
+            replicates
+
+    Raises:
+        ValueError: If there are fewer than two replicates, or if the metric
+            never varies within either variant (the interval would claim a
+            certainty the samples cannot support)
+    """
+    if replicates < 2:
+        raise ValueError("At least two replicates are needed for an interval")
+    antithetic = list(antithetic)
+
+    values_a = []
+    values_b = []
+    for i in range(replicates):
+        values_a.append(_replicate_value(seed + i, make_encounters_a, policy, metric, antithetic))
+        values_b.append(_replicate_value(seed + i, make_encounters_b, policy, metric, antithetic))
+
+    if _variance(values_a) == 0 and _variance(values_b) == 0:
+        raise ValueError(f"Metric {metric!r} is constant in both variants; "
+                         "choose a metric that varies between campaigns")
+
+    differences = [a - b for a, b in zip(values_a, values_b)]
+    difference = sum(differences) / replicates
+    std_error = math.sqrt(_variance(differences) / replicates)
+    independent_std_error = math.sqrt((_variance(values_a) + _variance(values_b)) / replicates)
+    z = _normal_quantile(0.5 + confidence / 2)
+
+    return {
+        "mean_a": sum(values_a) / replicates,
+        "mean_b": sum(values_b) / replicates,
+        "difference": difference,
+        "std_error": std_error,
+        "ci_low": difference - z * std_error,
+        "ci_high": difference + z * std_error,
+        "independent_std_error": independent_std_error,
+        "replicates": replicates,
+    }
+
+
+def _orc_axe_campaign(damage: int) -> Callable[[], List[Dict[str, Any]]]:
+    """Return a campaign builder with the Orc's Battle Axe set to a damage value."""
+    def build():
+        encounters = default_campaign()
+        for encounter in encounters:
+            if encounter["name"] == "Orc":
+                encounter["weapon"].base_damage = damage
+        return encounters
+    return build
+
+
+if __name__ == "__main__":
+    # The Dragon beats the default policy every time, so compare turns survived
+    result = compare_variants(_orc_axe_campaign(8), _orc_axe_campaign(9), replicates=2000,
+                              antithetic=("crit", "special", "run"))
+    print("Orc Battle Axe 8 vs 9 (turns survived)")
+    for key, value in result.items():
+        print(f"  {key:>22}: {value:.4f}" if isinstance(value, float) else f"  {key:>22}: {value}")
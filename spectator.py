@@ -0,0 +1,311 @@
+"""
+Compact spectator protocol for live RPG fights.
+
+Instead of re-sending the Character.__str__ text of both fighters every turn,
+a session sends a keyframe with the full state of both combatants and then a
+small binary delta per turn holding only what changed. Keyframes are repeated
+every few turns (and whenever a new enemy appears) so late joiners and lossy
+links can resynchronise.
+
+Message layout (all integers little-endian):
+
+    keyframe: b"K", turn (uint32), then for player and enemy:
+              name, weapon name (uint8 length + UTF-8 each),
+              health, max health, level, weapon damage (int32),
+              cooldown, flags (uint8)
+    delta:    b"D", turn (uint32), then for player and enemy:
+              change mask (uint8) followed by the changed fields in mask order
+
+Flags: bit 0 defending, bit 1 enraged, bit 2 boss.
+"""
+import struct
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+KEYFRAME = b"K"
+DELTA = b"D"
+
+_HEADER = struct.Struct("<cI")
+_KEY_FIELDS = struct.Struct("<iiiiBB")
+
+# Delta fields in mask-bit order: (state key, struct format)
+_DELTA_FIELDS = [
+    ("health", "<i"),
+    ("flags", "<B"),
+    ("cooldown", "<B"),
+    ("level", "<i"),
+    ("max_health", "<i"),
+    ("weapon_damage", "<i"),
+    ("weapon_name", None),  # Length-prefixed string
+]
+
+FLAG_DEFENDING = 1
+FLAG_ENRAGED = 2
+FLAG_BOSS = 4
+
+
+def combatant_state(character) -> Dict[str, Any]:
+    """
+    Capture the spectator-visible state of a character.
+
+    Args:
+        character (Character): Player or enemy
+
+    Returns:
+        dict: The fields sent in keyframes and deltas
+    """
+    flags = 0
+    if character.is_defending:
+        flags |= FLAG_DEFENDING
+    cooldown = 0
+    if character.is_boss:
+        flags |= FLAG_BOSS
+        if character.enraged:
+            flags |= FLAG_ENRAGED
+        cooldown = min(255, character.special_attack_cooldown)
+    return {
+        "name": character.name,
+        "health": character.health,
+        "max_health": character.max_health,
+        "level": character.level,
+        "flags": flags,
+        "cooldown": cooldown,
+        "weapon_damage": character.weapon.base_damage,
+        "weapon_name": character.weapon.name,
+    }
+
+
+def _pack_text(text: str) -> bytes:
+    """Encode a string with a one-byte length prefix (truncated to 255 bytes)."""
+    data = text.encode("utf-8")[:255]
+    return bytes((len(data),)) + data
+
+
+def _unpack_text(message: bytes, offset: int) -> Tuple[str, int]:
+    """Decode a length-prefixed string, returning it and the new offset."""
+    length = message[offset]
+    start = offset + 1
+    return message[start:start + length].decode("utf-8", "replace"), start + length
+
+
+class SpectatorEncoder:
+    """Turns a sequence of fight states into keyframes and deltas."""
+
+    def __init__(self, keyframe_interval: int = 20):
+        """
+        Initialise the encoder.
+
+        Args:
+            keyframe_interval (int, optional): Messages between keyframes
+        """
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._last: Optional[List[Dict[str, Any]]] = None
+        self._since_keyframe = 0
+
+    def encode(self, turn: int, player, enemy) -> bytes:
+        """
+        Encode the current fight state.
+
+        Args:
+            turn (int): Current turn number
+            player (Character): The player
+            enemy (Character): The current enemy
+
+        Returns:
+            bytes: A keyframe or delta message
+        """
+        states = [combatant_state(player), combatant_state(enemy)]
+        needs_keyframe = (self._last is None
+                          or self._since_keyframe >= self.keyframe_interval
+                          or any(new["name"] != old["name"] for new, old in zip(states, self._last)))
+
+        if needs_keyframe:
+            message = self._keyframe(turn, states)
+            self._since_keyframe = 0
+        else:
+            message = self._delta(turn, states)
+            self._since_keyframe += 1
+        self._last = states
+        return message
+
+    def is_keyframe(self, message: bytes) -> bool:
+        """Return True if a message is a keyframe."""
+        return message[:1] == KEYFRAME
+
+    @staticmethod
+    def _keyframe(turn: int, states: List[Dict[str, Any]]) -> bytes:
+        """Build a keyframe holding both combatants' full state."""
+        parts = [_HEADER.pack(KEYFRAME, turn)]
+        for state in states:
+            parts.append(_pack_text(state["name"]))
+            parts.append(_pack_text(state["weapon_name"]))
+            parts.append(_KEY_FIELDS.pack(state["health"], state["max_health"], state["level"],
+                                          state["weapon_damage"], state["cooldown"], state["flags"]))
+        return b"".join(parts)
+
+    def _delta(self, turn: int, states: List[Dict[str, Any]]) -> bytes:
+        """Build a delta holding only the fields that changed since the last message."""
+        parts = [_HEADER.pack(DELTA, turn)]
+        for state, old in zip(states, self._last):
+            mask = 0
+            fields = []
+            for bit, (key, fmt) in enumerate(_DELTA_FIELDS):
+                if state[key] != old[key]:
+                    mask |= 1 << bit
+                    fields.append(_pack_text(state[key]) if fmt is None else struct.pack(fmt, state[key]))
+            parts.append(bytes((mask,)))
+            parts.extend(fields)
+        return b"".join(parts)
+
+
+class SpectatorDecoder:
+    """Rebuilds the fight state on the spectator's side."""
+
+    def __init__(self):
+        """Initialise a decoder that is waiting for its first keyframe."""
+        self.turn = 0
+        self.combatants: Optional[List[Dict[str, Any]]] = None
+
+    def apply(self, message: bytes) -> Optional[List[Dict[str, Any]]]:
+        """
+        Apply one message.
+
+        Deltas that arrive before the first keyframe are ignored.
+
+        Args:
+            message (bytes): Keyframe or delta from a SpectatorEncoder
+
+        Returns:
+            list: Player and enemy state dictionaries, or None while waiting
+                for a keyframe
+        """
+        kind, self.turn = _HEADER.unpack_from(message)
+        offset = _HEADER.size
+        if kind == KEYFRAME:
+            self.combatants = []
+            for _ in range(2):
+                name, offset = _unpack_text(message, offset)
+                weapon_name, offset = _unpack_text(message, offset)
+                health, max_health, level, damage, cooldown, flags = _KEY_FIELDS.unpack_from(message, offset)
+                offset += _KEY_FIELDS.size
+                self.combatants.append({
+                    "name": name, "health": health, "max_health": max_health, "level": level,
+                    "flags": flags, "cooldown": cooldown, "weapon_damage": damage,
+                    "weapon_name": weapon_name,
+                })
+        elif self.combatants is not None:
+            for state in self.combatants:
+                mask = message[offset]
+                offset += 1
+                for bit, (key, fmt) in enumerate(_DELTA_FIELDS):
+                    if not mask & (1 << bit):
+                        continue
+                    if fmt is None:
+                        state[key], offset = _unpack_text(message, offset)
+                    else:
+                        state[key] = struct.unpack_from(fmt, message, offset)[0]
+                        offset += struct.calcsize(fmt)
+        return self.combatants
+
+
+class Subscriber:
+    """A local spectator's queue of messages."""
+
+    def __init__(self):
+        """Initialise an empty queue."""
+        self.queue: Deque[bytes] = deque()
+
+    def drain(self) -> List[bytes]:
+        """
+        Take every waiting message.
+
+        Returns:
+            list: Messages in the order they were published
+        """
+        messages = list(self.queue)
+        self.queue.clear()
+        return messages
+
+
+class SpectatorHub:
+    """
+    Fans one live fight out to many local spectators.
+
+    Each turn is encoded once and the same bytes object is queued for every
+    subscriber. A new subscriber is sent the latest keyframe and the deltas
+    since then, so it can start decoding straight away.
+    """
+
+    def __init__(self, keyframe_interval: int = 20):
+        """
+        Initialise the hub.
+
+        Args:
+            keyframe_interval (int, optional): Messages between keyframes
+        """
+        self.encoder = SpectatorEncoder(keyframe_interval)
+        self.subscribers: List[Subscriber] = []
+        self._catch_up: List[bytes] = []
+        self.bytes_encoded = 0
+
+    def subscribe(self) -> Subscriber:
+        """
+        Add a spectator.
+
+        Returns:
+            Subscriber: The new spectator's queue
+        """
+        subscriber = Subscriber()
+        subscriber.queue.extend(self._catch_up)
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """Remove a spectator."""
+        self.subscribers.remove(subscriber)
+
+    def publish(self, turn: int, player, enemy) -> bytes:
+        """
+        Encode the fight state once and queue it for every spectator.
+
+        Args:
+            turn (int): Current turn number
+            player (Character): The player
+            enemy (Character): The current enemy
+
+        Returns:
+            bytes: The shared encoded message
+        """
+        message = self.encoder.encode(turn, player, enemy)
+        self.bytes_encoded += len(message)
+        if self.encoder.is_keyframe(message):
+            self._catch_up = []
+        self._catch_up.append(message)
+        for subscriber in self.subscribers:
+            subscriber.queue.append(message)
+        return message
+
+    def on_turn(self, game):
+        """
+        Publish a game's state; add this to Game.turn_listeners.
+
+        Args:
+            game (Game): The game that just played a turn
+        """
+        if game.player and game.current_enemy:
+            self.publish(game.turn_count, game.player, game.current_enemy)
+
+
+if __name__ == "__main__":
+    from simulation import HeadlessGame
+
+    hub = SpectatorHub()
+    text_bytes = [0]
+
+    def count_text(game):
+        text_bytes[0] += len(f"{game.player}\n{game.current_enemy}".encode("utf-8"))
+
+    game = HeadlessGame()
+    game.turn_listeners.extend([hub.on_turn, count_text])
+    game.play()
+    print(f"Full text per turn: {text_bytes[0]} bytes, keyframes and deltas: {hub.bytes_encoded} bytes")
@@ -3,6 +3,7 @@ Weapon class for the RPG game.
 
 This module defines the Weapon class which represents weapons that can be equipped by characters.
 """
+import random
 from typing import Optional
 
 class Weapon:
@@ -14,9 +15,16 @@ class Weapon:
         base_damage (int): The base damage the weapon deals
         critical_chance (float): Chance to land a critical hit (0.0 to 1.0)
         critical_multiplier (float): Damage multiplier for critical hits
+        rng: Random number generator used for critical hit rolls
+        damage_rows (dict or None): Hit outcomes precomputed by
+            damage_tables.DamageTableCache; cleared whenever the stats change
     """
     
-    def __init__(self, name: str, base_damage: int, critical_chance: float = 0.1, critical_multiplier: float = 2.0):
+    # Shared module-level generator unless a dedicated one is injected
+    rng = random
+    
+    def __init__(self, name: str, base_damage: int, critical_chance: float = 0.1, critical_multiplier: float = 2.0,
+                 rng: Optional[random.Random] = None):
         """
         Initialize a new weapon.
         
@@ -25,12 +33,27 @@ class Weapon:
             base_damage (int): The base damage the weapon deals
             critical_chance (float, optional): Chance to land a critical hit (0.0 to 1.0)
             critical_multiplier (float, optional): Damage multiplier for critical hits
+            rng (random.Random, optional): Dedicated generator for critical hit rolls
         """
         self.name = name
         self.base_damage = base_damage
         self.critical_chance = max(0.0, min(1.0, critical_chance))  # Clamp between 0 and 1
         self.critical_multiplier = max(1.0, critical_multiplier)  # Ensure at least 1.0x
         self.critical_hit = False
+        self.damage_rows = None
+        if rng is not None:
+            self.rng = rng
+    
+    def reset(self, name: str, base_damage: int, critical_chance: float = 0.1, critical_multiplier: float = 2.0,
+              rng: Optional[random.Random] = None):
+        """
+        Re-initialise this weapon in place, as if it had just been constructed.
+        
+        Used by object pools to recycle weapons instead of allocating new ones.
+        Takes the same arguments as the constructor.
+        """
+        self.__dict__.pop("rng", None)  # Fall back to the shared generator
+        self.__init__(name, base_damage, critical_chance, critical_multiplier, rng)
     
     def calculate_damage(self) -> int:
         """
@@ -39,8 +62,6 @@ class Weapon:
         Returns:
             int: The calculated damage, including critical hits
         """
-        import random
-        
         # Reset critical hit flag
         self.critical_hit = False
         
@@ -48,7 +69,7 @@ class Weapon:
         damage = self.base_damage
         
         # Check for critical hit
-        if random.random() < self.critical_chance:
+        if self.rng.random() < self.critical_chance:
             damage = int(damage * self.critical_multiplier)
             self.critical_hit = True
         
@@ -72,6 +93,7 @@ class Weapon:
             damage_increase (int, optional): Amount to increase base damage by
         """
         self.base_damage += damage_increase
+        self.clear_damage_rows()
     
     def set_critical_chance(self, chance: float):
         """
@@ -81,6 +103,7 @@ class Weapon:
             chance (float): New critical hit chance (0.0 to 1.0)
         """
         self.critical_chance = max(0.0, min(1.0, chance))  # Clamp between 0 and 1
+        self.clear_damage_rows()
     
     def set_critical_multiplier(self, multiplier: float):
         """
@@ -90,3 +113,8 @@ class Weapon:
             multiplier (float): New critical hit multiplier (must be ≥ 1.0)
         """
         self.critical_multiplier = max(1.0, multiplier)  # Ensure at least 1.0x
+        self.clear_damage_rows()
+    
+    def clear_damage_rows(self):
+        """Forget precomputed hit outcomes; call after changing the stats by hand."""
+        self.damage_rows = None